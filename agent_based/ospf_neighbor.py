@@ -37,6 +37,28 @@
 #  2020-07-26: added parse section, alias, wato for alias and state
 #  2021-09-15: rewritten for CMK 2.0
 #  2023-04-22: moved wato/metrics file to ~/local/lib/check_mk/gui/plugins/(wato|metrics)
+#  2026-10-18: precompile check parameters (peer_list index, state map) once per parameter set
+#             compact section: table driven decoding, states/enums kept as int and rendered on output
+#             added optional host level summary service (discovery rule 'OSPF neighbor discovery')
+#             moved display only columns (permanence, hello suppressed, helper) to section ospf_neighbor_details
+#             item from the table index (OIDEnd) instead of fetching ospfNbrIpAddr, address-less neighbors as IP%ifIndex
+#             detect on ospfAdminStat before querying the neighbor table, optional sysObjectID prefilter
+#             added events per minute (Counter32 wrap and reset aware) with optional levels
+#             added bounded per neighbor state change history and flap detection
+#             added option to show static neighbor attributes only on change
+#             added opt-in instrumentation of parse and check (rule or env OSPF_NEIGHBOR_INSTRUMENTATION)
+#             added discovery filters on neighbor networks, router ID networks, permanence and state
+#             added inventory of the OSPF neighbors (Networking -> OSPF -> Neighbors)
+#             added agent sections for the piggyback data of the special agent agent_ospf_neighbor
+#             added optional cross-router adjacency correlation (section ospf_general, service 'OSPF adjacencies')
+#             less imports at load time (no dataclasses and tempfile)
+#             added peers from a CSV/JSON file on the site and alias templates per network
+#             added neighbor states from SNMP traps (ospfNbrStateChange) recorded by bin/ospf_neighbor_trap_bridge
+#             added opt-in export of the parsed section to a rotating JSON lines file (env OSPF_NEIGHBOR_EXPORT)
+#             export written from the check functions once per parsed section, not on discovery/inventory
+#             added OSPFv3 neighbors (section ospfv3_neighbor, service 'OSPFv3 neighbor'), one table driven parser
+#             neighbors of other OSPF instances (SNMP contexts/VRFs) from the special agent as "<context>:<item>"
+#             added levels on the retransmission queue length (moving average and/or sustained)
 #
 ###############################################################################
 
@@ -68,19 +90,26 @@
 #
 # sample parsed
 # {
-#  '172.17.108.52': OspfNeighbor(
-#       rtrid='10.253.128.139', options='not a stub area', prio='1', state='8', events=6,
-#       permanence='dynamic', hellosup='false', helperstatus='', helperage='', helperexitreason=''
-#      ),
-#  '172.17.108.60': OspfNeighbor(
-#       rtrid='10.253.128.139', options='not a stub area', prio='1', state='8', events=6,
-#       permanence='dynamic', hellosup='false', helperstatus='', helperage='', helperexitreason=''
-#      )
+#  '172.17.108.52': OspfNeighbor(rtrid='10.253.128.139', options=2, prio=1, state=8, events=6, lsretransqlen=0),
+#  '172.17.108.60': OspfNeighbor(rtrid='10.253.128.139', options=2, prio=1, state=8, events=6, lsretransqlen=0),
+# }
+#
+# sample parsed ospf_neighbor_details
+# {
+#  '172.17.108.52': OspfNeighborDetails(permanence=1, hellosup=2, helperstatus=-1, helperage=-1, helperexitreason=-1),
+#  '172.17.108.60': OspfNeighborDetails(permanence=1, hellosup=2, helperstatus=-1, helperage=-1, helperexitreason=-1),
 # }
 #
 
-from dataclasses import dataclass
-from typing import Dict
+import json
+import logging
+import os
+import sys
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from ipaddress import IPv4Address, IPv4Network
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
 
 from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     register,
@@ -88,186 +117,1495 @@ from cmk.base.plugins.agent_based.agent_based_api.v1 import (
     Result,
     State,
     SNMPTree,
+    all_of,
+    any_of,
+    equals,
     exists,
+    startswith,
+    OIDEnd,
     Metric,
+    check_levels,
+    get_average,
+    get_value_store,
+    render,
+    TableRow,
 )
 from cmk.base.plugins.agent_based.agent_based_api.v1.type_defs import (
     DiscoveryResult,
     CheckResult,
+    InventoryResult,
     StringTable,
 )
 
+try:
+    from cmk.base.plugin_contexts import host_name as _host_name
+except ImportError:  # older versions and outside a Checkmk site
+    _host_name = None
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# opt-in instrumentation of parse and check (duration, rows, section size)
+_INSTRUMENTATION = os.environ.get('OSPF_NEIGHBOR_INSTRUMENTATION', '') not in ['', '0']
+
+_NA = -1  # value not available or not numeric
+
+# OSPF-MIB::ospfNbrState
+OSPF_NBR_STATE_NAMES = {
+    1: 'down',
+    2: 'attempt',
+    3: 'init',
+    4: 'twoWay',
+    5: 'exchangeStart',
+    6: 'exchange',
+    7: 'loading',
+    8: 'full',
+}
+
+# OSPF-MIB::ospfNbrPermanence
+_OSPF_NBR_PERMANENCE_NAMES = {
+    1: 'dynamic',
+    2: 'permanent',
+}
+
+# OSPF-MIB::ospfNbrHelloSuppressed
+_OSPF_NBR_HELLOSUPPRESSED_NAMES = {
+    1: 'true',
+    2: 'false',
+}
+
+# OSPF-MIB::ospfNbrRestartHelperStatus
+_OSPF_NBR_HELPERSTATUS_NAMES = {
+    1: 'notHelping',
+    2: 'helping',
+}
+
+# OSPF-MIB::ospfNbrRestartHelperExitReason
+_OSPF_NBR_HELPEREXITREASON_NAMES = {
+    1: 'none',
+    2: 'inProgress',
+    3: 'completed',
+    4: 'timedOut',
+    5: 'topologyChanged',
+}
+
+
+def _ospf_nbr_options_text(options: int) -> str:
+    """
+    A bit mask corresponding to the neighbor's options field.
+    Bit 0, if set, indicates that the system will operate on Type of Service metrics other than TOS 0.
+           If zero, the neighbor will ignore all metrics except the TOS 0 metric.
+    Bit 1, if set, indicates that the associated area accepts and operates on external information;
+           if zero, it is a stub area.
+    Bit 2, if set, indicates that the system is capable of routing IP multicast datagrams, that is that it
+           implements the multicast extensions to OSPF.
+    Bit 3, if set, indicates that the associated area is an NSSA. These areas are capable of carrying type-7
+           external advertisements, which are translated into type-5 external advertisements at NSSA borders.
+    """
+    return ', '.join(value for key, value in [
+        (1, 'non TOS 0 service metrics accepted'),
+        (2, 'not a stub area'),
+        (4, 'IP multicast routing capable'),
+        (8, 'is NSSA'),
+    ] if options & key == key) or 'unknown'
+
+
+# OSPF-MIB::ospfNbrOptions, indexed by the four defined option bits
+_OSPF_NBR_OPTIONS_TEXT = tuple(_ospf_nbr_options_text(options) for options in range(16))
+
+
+# OSPFV3-MIB::ospfv3NbrOptions (RFC 5340 A.2, RFC 5838, RFC 5613)
+_OSPFV3_NBR_OPTIONS = [
+    (0x001, 'V6'),
+    (0x002, 'E'),
+    (0x008, 'N'),
+    (0x010, 'R'),
+    (0x020, 'DC'),
+    (0x100, 'AF'),
+    (0x200, 'L'),
+]
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return _NA
 
-@dataclass
-class OspfNeighbor:
+
+def _decode(names: Dict[int, str], value: int) -> str:
+    if value == _NA:
+        return ''
+    return names.get(value, str(value))
+
+
+def ospf_nbr_state(st: int) -> str:
+    return OSPF_NBR_STATE_NAMES.get(st, 'unknown: %s' % st)
+
+
+class OspfNeighbor(NamedTuple):
+    """
+    One row of the OSPF-MIB::ospfNbrTable. States and enumerations are kept as their integer
+    values (_NA if not available) and are decoded to text only when rendered.
+    """
     rtrid: str
-    options: str
-    prio: str
-    state: str
+    options: int
+    prio: int
+    state: int
     events: int
     lsretransqlen: int
-    permanence: str
-    hellosup: str
-    helperstatus: str
-    helperage: str
-    helperexitreason: str
-
-
-def parse_ospf_neighbor(string_table: StringTable) -> Dict[str, OspfNeighbor]:
-    def ospf_nbr_hellosuppressed(st: str) -> str:
-        names = {'1': 'true',
-                 '2': 'false'}
-        return names.get(st, st)
-
-    def ospf_nbr_permanence(st: str) -> str:
-        names = {'1': 'dynamic',
-                 '2': 'permanent'}
-        return names.get(st, st)
-
-    def ospf_nbr_helperstatus(st: str) -> str:
-        names = {'1': 'notHelping',
-                 '2': 'helping'}
-        return names.get(st, st)
-
-    def ospf_nbr_helperexitreason(st: str) -> str:
-        names = {'1': 'none',
-                 '2': 'inProgress',
-                 '3': 'completed',
-                 '4': 'timedOut',
-                 '5': 'topologyChanged'}
-        return names.get(st, st)
-
-    def ospf_nbr_options(st: str) -> str:
-        """
-        A bit mask corresponding to the neighbor's options field.
-        Bit 0, if set, indicates that the system will operate on Type of Service metrics other than TOS 0.
-               If zero, the neighbor will ignore all metrics except the TOS 0 metric.
-        Bit 1, if set, indicates that the associated area accepts and operates on external information;
-               if zero, it is a stub area.
-        Bit 2, if set, indicates that the system is capable of routing IP multicast datagrams, that is that it
-               implements the multicast extensions to OSPF.
-        Bit 3, if set, indicates that the associated area is an NSSA. These areas are capable of carrying type-7
-               external advertisements, which are translated into type-5 external advertisements at NSSA borders.
-        """
-        try:
-            st = ord(st)
-        except TypeError:
+
+    @property
+    def options_text(self) -> str:
+        if self.options == _NA:
             return 'unknown'
+        return _OSPF_NBR_OPTIONS_TEXT[self.options & 0x0f]
+
+    @property
+    def prio_text(self) -> str:
+        return '' if self.prio == _NA else str(self.prio)
 
-        options = []
-        for key, value in [
-            (1, 'non TOS 0 service metrics accepted'),
-            (2, 'not a stub area'),
-            (4, 'IP multicast routing capable'),
-            (8, 'is NSSA'),
-        ]:
-            if st & key == key:
-                options.append(value)
-
-        options = ', '.join(options)
-        if options == '':
+    @property
+    def state_text(self) -> str:
+        return ospf_nbr_state(self.state)
+
+
+class Ospfv3Neighbor(OspfNeighbor):
+    """
+    One row of the OSPFV3-MIB::ospfv3NbrTable, the router ID is taken from the table index.
+    """
+    __slots__ = ()
+
+    @property
+    def options_text(self) -> str:
+        if self.options == _NA:
             return 'unknown'
-        else:
-            return options
+        return ', '.join(text for bit, text in _OSPFV3_NBR_OPTIONS if self.options & bit) or 'none'
 
-    parsed = {}
-    for ip, rtrid, options, prio, state, events, lsretransqlen, permanence, hellosup, helperstatus, helperage, \
-        helperexitreason in string_table:
-        parsed[ip] = OspfNeighbor(
+
+class OspfNeighborDetails(NamedTuple):
+    """
+    Display only columns of the OSPF-MIB::ospfNbrTable (permanence, hello suppressed and the
+    graceful restart helper columns), fetched by the optional section ospf_neighbor_details.
+    """
+    permanence: int
+    hellosup: int
+    helperstatus: int
+    helperage: int
+    helperexitreason: int
+
+    @property
+    def permanence_text(self) -> str:
+        return _decode(_OSPF_NBR_PERMANENCE_NAMES, self.permanence)
+
+    @property
+    def hellosup_text(self) -> str:
+        return _decode(_OSPF_NBR_HELLOSUPPRESSED_NAMES, self.hellosup)
+
+    @property
+    def helperstatus_text(self) -> str:
+        return _decode(_OSPF_NBR_HELPERSTATUS_NAMES, self.helperstatus)
+
+    @property
+    def helperage_text(self) -> str:
+        return '' if self.helperage == _NA else str(self.helperage)
+
+    @property
+    def helperexitreason_text(self) -> str:
+        return _decode(_OSPF_NBR_HELPEREXITREASON_NAMES, self.helperexitreason)
+
+
+def split_context(item: str) -> Tuple[str, str]:
+    """
+    Context and item without the context. Neighbors of other OSPF instances (SNMP contexts, i.e. VRFs)
+    polled by the special agent have the context in front of the item, i.e. "RED:10.10.10.10".
+    """
+    context, _sep, item = item.rpartition(':')
+    return context, item
+
+
+def ospf_nbr_item(oid_end: str) -> str:
+    """
+    The ospfNbrTable is indexed by ospfNbrIpAddr.ospfNbrAddressLessIndex. The item is the neighbor
+    IP address. For address-less neighbors (index not 0) the interface index is appended like an
+    IPv6 zone index, so neighbors sharing one address on several unnumbered links don't collide.
+    """
+    ip, address_less_index = oid_end.rsplit('.', 1)
+    if address_less_index == '0':
+        return ip
+    return f'{ip}%{address_less_index}'
+
+
+def ospfv3_nbr_item(oid_end: str) -> str:
+    """
+    The ospfv3NbrTable is indexed by ospfv3NbrIfIndex.ospfv3NbrIfInstId.ospfv3NbrRtrId, the neighbor
+    address is usually link local. The item is the neighbor router ID and the interface index, for
+    interface instances other than 0 followed by the instance ID (i.e. "10.10.10.10%12.1").
+    """
+    if_index, instance, rtrid = oid_end.split('.')
+    if instance == '0':
+        return f'{_ospfv3_rtrid(oid_end)}%{if_index}'
+    return f'{_ospfv3_rtrid(oid_end)}%{if_index}.{instance}'
+
+
+def _ospfv3_rtrid(oid_end: str) -> str:
+    # ospfv3NbrRtrId is an Unsigned32 in the index, shown as dotted quad like the OSPFv2 router IDs
+    return str(IPv4Address(int(oid_end.rsplit('.', 1)[1])))
+
+
+class NeighborTable(NamedTuple):
+    """
+    Decoding of an OSPF neighbor table to the section. All tables have the table index (OIDEnd)
+    as first column and options, priority, state, events and retransmission queue length as the
+    last five columns. The router ID is the column in between or is taken from the index.
+    """
+    name: str
+    item: Callable[[str], str]
+    rtrid: Optional[Callable[[str], str]]  # router ID from the index, None if it is a column
+    options: Callable[[str], int]
+    neighbor: Callable[..., OspfNeighbor]
+
+
+class OspfNeighborSection(Dict[str, OspfNeighbor]):
+    """
+    The parsed section ospf_neighbor. Remembers the number of rows and the duration of the parse
+    function for the instrumentation, the name of the table and if it was exported.
+    """
+    rows: int = 0
+    parse_duration: float = 0.0
+    table: str = ''
+    exported: bool = False
+    _address_keys: Optional[Dict[str, str]] = None
+
+    def address_keys(self) -> Dict[str, str]:
+        """
+        IP address -> key of the last address-less neighbor (IP%ifIndex) on it, built once per section
+        on first use.
+        """
+        if self._address_keys is None:
+            self._address_keys = {key.split('%', 1)[0]: key for key in self if '%' in key}
+        return self._address_keys
+
+
+def _section_size(section: Dict[str, OspfNeighbor]) -> int:
+    """
+    Approximate memory of the parsed section in bytes (the small ints are shared and not counted).
+    """
+    return sys.getsizeof(section) + sum(
+        sys.getsizeof(item) + sys.getsizeof(neighbor) + sys.getsizeof(neighbor.rtrid)
+        for item, neighbor in section.items()
+    )
+
+
+def _options_octet(options: str) -> int:
+    if options.isdigit():
+        return int(options)  # rendered as number, like the agent section
+    return ord(options) if len(options) == 1 else _NA  # raw OCTET STRING
+
+
+def parse_ospf_neighbor(string_table: StringTable) -> OspfNeighborSection:
+    return parse_neighbor_table(string_table, _OSPF_NBR_TABLE)
+
+
+def parse_ospf_neighbor_agent(string_table: StringTable) -> OspfNeighborSection:
+    return parse_neighbor_table(string_table, _OSPF_NBR_TABLE_AGENT)
+
+
+def parse_ospfv3_neighbor(string_table: StringTable) -> OspfNeighborSection:
+    return parse_neighbor_table(string_table, _OSPFV3_NBR_TABLE)
+
+
+def _context_item(index: str, item: Callable[[str], str]) -> str:
+    # the special agent writes the index of neighbors in other SNMP contexts as "<context>:<index>"
+    context, _sep, index = index.rpartition(':')
+    return f'{context}:{item(index)}' if context else item(index)
+
+
+def parse_neighbor_table(string_table: StringTable, table: NeighborTable) -> OspfNeighborSection:
+    start = time.perf_counter()
+    parsed = OspfNeighborSection()
+    item, rtrid_from_index, parse_options, neighbor = table.item, table.rtrid, table.options, table.neighbor
+    for row in string_table:
+        index = row[0]
+        options, prio, state, events, lsretransqlen = row[-5:]
+        if rtrid_from_index is None:
+            rtrid = row[1]
+        else:
+            rtrid = rtrid_from_index(index)
+        parsed[_context_item(index, item)] = neighbor(
             rtrid=rtrid,
-            options=ospf_nbr_options(options),
-            prio=prio,
-            state=state,
+            options=parse_options(options),
+            prio=_to_int(prio),
+            state=_to_int(state),
             events=int(events),
             lsretransqlen=int(lsretransqlen),
-            permanence=ospf_nbr_permanence(str(permanence)),
-            hellosup=ospf_nbr_hellosuppressed(hellosup),
-            helperstatus=ospf_nbr_helperstatus(helperstatus),
-            helperage=helperage,
-            helperexitreason=ospf_nbr_helperexitreason(helperexitreason),
+        )
+    parsed.rows = len(string_table)
+    parsed.parse_duration = time.perf_counter() - start
+    parsed.table = table.name
+    if _INSTRUMENTATION:
+        _LOGGER.debug(
+            'ospf_neighbor: parsed %d rows of %s in %.6f s, section size %d bytes',
+            parsed.rows, table.name, parsed.parse_duration, _section_size(parsed),
         )
     return parsed
 
 
-def discovery_ospf_neighbor(section: Dict[str, OspfNeighbor]) -> DiscoveryResult:
-    for neighbor in section.keys():
-        yield Service(item=neighbor)
+_OSPF_NBR_TABLE = NeighborTable(
+    name='ospf_neighbor',
+    item=ospf_nbr_item,
+    rtrid=None,
+    options=_options_octet,
+    neighbor=OspfNeighbor,
+)
+# the special agent agent_ospf_neighbor writes ospfNbrOptions as integer
+_OSPF_NBR_TABLE_AGENT = _OSPF_NBR_TABLE._replace(options=_to_int)
+_OSPFV3_NBR_TABLE = NeighborTable(
+    name='ospfv3_neighbor',
+    item=ospfv3_nbr_item,
+    rtrid=_ospfv3_rtrid,
+    options=_to_int,
+    neighbor=Ospfv3Neighbor,
+)
 
 
-def check_ospf_neighbor(item, params, section: Dict[str, OspfNeighbor]) -> CheckResult:
-    def ospf_nbr_state(st: str) -> str:
-        names = {
-            '1': 'down',
-            '2': 'attempt',
-            '3': 'init',
-            '4': 'twoWay',
-            '5': 'exchangeStart',
-            '6': 'exchange',
-            '7': 'loading',
-            '8': 'full'
-        }
-        return names.get(st, 'unknown: %s' % st)
-
-    # default monitoring states for ospfNbrState
-    neighborstate = {
-        '1': 2,  # down
-        '2': 1,  # attempt
-        '3': 1,  # init
-        '4': 0,  # twoWay
-        '5': 1,  # exchangeStart
-        '6': 1,  # exchange
-        '7': 1,  # loading
-        '8': 0,  # full
+# opt-in export of the parsed section for other consumers (OSPF_NEIGHBOR_EXPORT=1 or a directory).
+# Written from the check functions, once per parsed section (not on discovery or inventory).
+# One JSON line per parsed section: {"section": "ospf_neighbor|ospfv3_neighbor", "host": ..., "time": ...,
+# "neighbors": [[item, rtrid, options, prio, state, events, lsretransqlen], ...]}
+_EXPORT_DIR = os.environ.get('OSPF_NEIGHBOR_EXPORT', '')
+if _EXPORT_DIR == '0':
+    _EXPORT_DIR = ''
+elif _EXPORT_DIR == '1':
+    _EXPORT_DIR = os.path.join(
+        os.environ['OMD_ROOT'], 'tmp', 'check_mk', 'ospf_neighbor', 'export'
+    ) if 'OMD_ROOT' in os.environ else os.path.join(os.environ.get('TMPDIR', '/tmp'), 'ospf_neighbor', 'export')
+_EXPORT_FILE = 'ospf_neighbor.jsonl'
+# the export file is rotated above this size, rotated files are kept as .1 (newest) to .<_EXPORT_FILES>
+_EXPORT_MAX_SIZE = max(_to_int(os.environ.get('OSPF_NEIGHBOR_EXPORT_MAX_SIZE', '10485760')), 4096)
+_EXPORT_FILES = max(_to_int(os.environ.get('OSPF_NEIGHBOR_EXPORT_FILES', '4')), 1)
+
+
+def _current_host() -> str:
+    if _host_name is None:
+        return ''
+    try:
+        return _host_name()
+    except RuntimeError:  # no host in the context, i.e. in tools
+        return ''
+
+
+def _export_once(section: OspfNeighborSection) -> None:
+    """
+    Exports the section on the first check call of the host. The section is parsed once per check
+    cycle and shared by all services, the other services skip the export.
+    """
+    if not _EXPORT_DIR or section.exported:
+        return
+    section.exported = True
+    try:
+        _export_section(section.table, section, time.time())
+    except OSError as exc:
+        _LOGGER.debug('ospf_neighbor: export of the parsed section %s failed: %s', section.table, exc)
+
+
+def _export_section(name: str, section: Dict[str, OspfNeighbor], now: float) -> None:
+    """
+    Appends the section as one line to the export file. The line is written with a single write
+    to the file opened with O_APPEND, so lines of concurrent check helpers are never mixed and
+    readers see only complete lines (up to a partial last line while it is written). The write is
+    synchronous, on a local file system it takes about as long as the check of one neighbor.
+    """
+    line = json.dumps({
+        'section': name,
+        'host': _current_host(),
+        'time': round(now, 3),
+        'neighbors': [[item, *neighbor] for item, neighbor in section.items()],
+    }, separators=(',', ':')) + '\n'
+    path = os.path.join(_EXPORT_DIR, _EXPORT_FILE)
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        fd = os.open(path, flags, 0o644)
+    except FileNotFoundError:
+        os.makedirs(_EXPORT_DIR, exist_ok=True)
+        fd = os.open(path, flags, 0o644)
+    try:
+        os.write(fd, line.encode('utf-8'))
+        stat = os.fstat(fd)
+    finally:
+        os.close(fd)
+    if stat.st_size > _EXPORT_MAX_SIZE:
+        _rotate_export(path, stat.st_ino)
+
+
+def _rotate_export(path: str, inode: int) -> None:
+    """
+    Rotates the export file, if it was not rotated by another process already. The file is first
+    renamed to a name of this process, only one process can do this, then the older files are
+    shifted and the oldest one is dropped.
+    """
+    claimed = f'{path}.{os.getpid()}.rotate'
+    try:
+        if os.stat(path).st_ino != inode:
+            return
+        os.rename(path, claimed)
+    except OSError:
+        return
+    for generation in range(_EXPORT_FILES - 1, 0, -1):
+        try:
+            os.replace(f'{path}.{generation}', f'{path}.{generation + 1}')
+        except FileNotFoundError:
+            pass
+    os.replace(claimed, f'{path}.1')
+
+
+def parse_ospf_neighbor_details(string_table: StringTable) -> Dict[str, OspfNeighborDetails]:
+    parsed = {}
+    for oid_end, permanence, hellosup, helperstatus, helperage, helperexitreason in string_table:
+        parsed[_context_item(oid_end, ospf_nbr_item)] = OspfNeighborDetails(
+            permanence=_to_int(permanence),
+            hellosup=_to_int(hellosup),
+            helperstatus=_to_int(helperstatus),
+            helperage=_to_int(helperage),
+            helperexitreason=_to_int(helperexitreason),
+        )
+    return parsed
+
+
+class OspfGeneral(NamedTuple):
+    router_id: str
+    admin_stat: int
+
+
+def parse_ospf_general(string_table: StringTable) -> Optional[OspfGeneral]:
+    for router_id, admin_stat in string_table:
+        try:
+            IPv4Address(router_id)
+        except ValueError:
+            return None  # the router ID is used as spool/trap file name, no file without a valid one
+        return OspfGeneral(router_id=router_id, admin_stat=_to_int(admin_stat))
+    return None
+
+
+class PrefixMatcher:
+    """
+    Matches IPv4 addresses against a list of networks. The networks are compiled once into sorted
+    and merged address intervals, so a lookup is a binary search.
+    """
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, networks: Iterable[str]) -> None:
+        intervals = []
+        for network in networks:
+            try:
+                ip_network = IPv4Network(network, strict=False)
+            except ValueError:
+                continue
+            intervals.append((int(ip_network.network_address), int(ip_network.broadcast_address)))
+        intervals.sort()
+
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for start, end in intervals:
+            if self._ends and start <= self._ends[-1] + 1:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __contains__(self, address: str) -> bool:
+        try:
+            value = int(IPv4Address(address))
+        except ValueError:
+            return False
+        index = bisect_right(self._starts, value) - 1
+        return index >= 0 and value <= self._ends[index]
+
+
+class PrefixTable:
+    """
+    Longest prefix match of IPv4 addresses on networks with a value. Keeps one dict per prefix
+    length, so a lookup is one dict access per distinct prefix length, longest first.
+    """
+    __slots__ = ('_tables',)
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]) -> None:
+        tables: Dict[int, Dict[int, Any]] = {}
+        for network, value in entries:
+            try:
+                ip_network = IPv4Network(network, strict=False)
+            except ValueError:
+                continue
+            # the first entry of a network wins
+            tables.setdefault(ip_network.prefixlen, {}).setdefault(int(ip_network.network_address), value)
+        self._tables = [
+            ((0xffffffff << (32 - length)) & 0xffffffff, table)
+            for length, table in sorted(tables.items(), reverse=True)
+        ]
+
+    def get(self, address: str) -> Any:
+        try:
+            value = int(IPv4Address(address))
+        except ValueError:
+            return None
+        for mask, table in self._tables:
+            entry = table.get(value & mask)
+            if entry is not None:
+                return entry
+        return None
+
+
+def _discovery_matchers(params: Mapping[str, Any]) -> Dict[str, PrefixMatcher]:
+    """
+    Compiles the network filters of the discovery rule once per discovery, not per neighbor.
+    """
+    return {
+        rule_key: PrefixMatcher(params[rule_key])
+        for rule_key in ['include_networks', 'exclude_networks', 'include_router_ids', 'exclude_router_ids']
+        if rule_key in params
     }
 
-    not_found_state = params['state_not_found']
 
-    for neighbour, neighbourAlias, neighbourNotFoundState in params.get('peer_list', []):
-        if item == neighbour:
-            yield Result(state=State.OK, summary=f'[{neighbourAlias}]')
-            not_found_state = neighbourNotFoundState
+def _discover_neighbor(
+        address: Optional[str],
+        neighbor: OspfNeighbor,
+        details: Optional[OspfNeighborDetails],
+        params: Mapping[str, Any],
+        matchers: Dict[str, PrefixMatcher],
+) -> bool:
+    for key, value in [
+        ('networks', address),
+        ('router_ids', neighbor.rtrid),
+    ]:
+        if value is None:
+            continue
+        include = matchers.get(f'include_{key}')
+        if include is not None and value not in include:
+            return False
+        exclude = matchers.get(f'exclude_{key}')
+        if exclude is not None and value in exclude:
+            return False
+    if 'states' in params and neighbor.state not in params['states']:
+        return False
+    # the permanence is in the optional section ospf_neighbor_details, don't filter if it is missing
+    # or not implemented by the device
+    permanence = details.permanence if details is not None else _NA
+    if 'permanence' in params and permanence != _NA and permanence not in params['permanence']:
+        return False
+    return True
+
+
+def discovery_ospf_neighbor(
+        params,
+        section_ospf_neighbor: Optional[Dict[str, OspfNeighbor]],
+        section_ospf_neighbor_details: Optional[Dict[str, OspfNeighborDetails]],
+        section_ospf_general: Optional[OspfGeneral],
+) -> DiscoveryResult:
+    if params['mode'] not in ['single', 'both'] or not section_ospf_neighbor:
+        return
+    section_ospf_neighbor_details = section_ospf_neighbor_details or {}
+    matchers = _discovery_matchers(params)
+    items = [
+        item for item, neighbor in section_ospf_neighbor.items()
+        if _discover_neighbor(
+            split_context(item)[1].split('%', 1)[0], neighbor, section_ospf_neighbor_details.get(item), params,
+            matchers,
+        )
+    ]
+    if params.get('item') == 'ip':
+        # compatibility: item is the IP address only, address-less neighbors on one IP are merged
+        items = list(dict.fromkeys(item.split('%', 1)[0] for item in items))
+    for item in items:
+        yield Service(item=item)
+
+
+def discovery_ospfv3_neighbor(params, section: Dict[str, OspfNeighbor]) -> DiscoveryResult:
+    if params['mode'] not in ['single', 'both']:
+        return
+    matchers = _discovery_matchers(params)
+    for item, neighbor in section.items():
+        # the neighbor addresses are link local, only the router ID filters apply
+        if _discover_neighbor(None, neighbor, None, params, matchers):
+            yield Service(item=item)
+
+
+def _get_neighbor_key(item: str, section: OspfNeighborSection) -> Optional[str]:
+    if item in section:
+        return item
+    # item is the IP address only (compatibility item or discovered before address-less neighbors
+    # got their own item). Use the last matching neighbor, like the section did before.
+    return section.address_keys().get(item)
+
+
+def discovery_ospf_neighbor_summary(params, section: Dict[str, OspfNeighbor]) -> DiscoveryResult:
+    if params['mode'] in ['summary', 'both'] and section:
+        yield Service()
+
+
+# default monitoring states for ospfNbrState
+DEFAULT_NEIGHBOR_STATE = {
+    1: 2,  # down
+    2: 1,  # attempt
+    3: 1,  # init
+    4: 0,  # twoWay
+    5: 1,  # exchangeStart
+    6: 1,  # exchange
+    7: 1,  # loading
+    8: 0,  # full
+}
+
+
+class CompiledParams(NamedTuple):
+    state_not_found: int
+    peers: Dict[str, Tuple[str, int]]  # item -> (alias, state if not found)
+    neighborstate: Dict[int, int]  # ospfNbrState -> monitoring state
+    peer_file: str  # CSV or JSON file with more peers, '' if not configured
+    peer_networks: Optional[PrefixTable]  # network -> (alias template, state if not found, valid template)
+
+
+_COMPILED_PARAMS_CACHE_SIZE = 32
+# (key, id of value) of the params -> (values, CompiledParams), the values are kept so their ids are not reused
+_compiled_params_by_id: 'OrderedDict[Tuple[Tuple[str, int], ...], Tuple[Tuple[Any, ...], CompiledParams]]' = \
+    OrderedDict()
+_compiled_params_cache: 'OrderedDict[int, Tuple[Any, CompiledParams]]' = OrderedDict()
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Shallow, hashable copy of the rule parameters. Lists are converted to tuples of their (already
+    hashable) elements, so the elements are hashed in C without walking them in python.
+    """
+    if isinstance(value, Mapping):
+        return tuple((key, _freeze(val)) for key, val in value.items())
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _valid_alias_template(alias: str) -> bool:
+    """
+    Tries the alias template of a network once with a sample address. The fields are the same for
+    every IPv4 address, so a template that fails here fails for all neighbors and is used as is.
+    """
+    try:
+        alias.format(ip='0.0.0.0', item='0.0.0.0', octets=['0', '0', '0', '0'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _compile_params(params: Mapping[str, Any]) -> CompiledParams:
+    neighborstate = DEFAULT_NEIGHBOR_STATE.copy()
+    neighborstate.update((int(st), state) for st, state in params.get('neighborstate', {}).items())
+    return CompiledParams(
+        state_not_found=params.get('state_not_found', 3),
+        peers={
+            neighbour: (neighbour_alias, neighbour_not_found_state)
+            for neighbour, neighbour_alias, neighbour_not_found_state in params.get('peer_list', [])
+        },
+        neighborstate=neighborstate,
+        peer_file=params.get('peer_file', ''),
+        peer_networks=PrefixTable(
+            (network, (alias, state, _valid_alias_template(alias))) for network, alias, state in params['peer_networks']
+        ) if params.get('peer_networks') else None,
+    )
+
+
+def get_compiled_params(params: Mapping[str, Any]) -> CompiledParams:
+    """
+    Returns the precompiled form of the check parameters.
+
+    The check is called once per neighbor. Every service gets its own params object, but the values
+    (i.e. the peer_list) are the objects of the matching rules, shared by all services of the host.
+    The compiled parameters are cached by the identity of these values, so the lookup does not depend
+    on the length of the peer_list. Only for new values a content key is built, equal rules are
+    compiled once (bounded LRU caches).
+    """
+    id_key = tuple((key, id(value)) for key, value in params.items())
+    cached_by_id = _compiled_params_by_id.get(id_key)
+    if cached_by_id is not None:
+        _compiled_params_by_id.move_to_end(id_key)
+        return cached_by_id[1]
+
+    key: Any = _freeze(params)
+    try:
+        key_hash = hash(key)
+    except TypeError:
+        key = repr(params)
+        key_hash = hash(key)
+
+    cached = _compiled_params_cache.get(key_hash)
+    if cached is not None and cached[0] == key:
+        compiled = cached[1]
+        _compiled_params_cache.move_to_end(key_hash)
+    else:
+        compiled = _compile_params(params)
+        _compiled_params_cache[key_hash] = (key, compiled)
+        if len(_compiled_params_cache) > _COMPILED_PARAMS_CACHE_SIZE:
+            _compiled_params_cache.popitem(last=False)
+
+    _compiled_params_by_id[id_key] = (tuple(params.values()), compiled)
+    if len(_compiled_params_by_id) > _COMPILED_PARAMS_CACHE_SIZE:
+        _compiled_params_by_id.popitem(last=False)
+    return compiled
+
+
+# path -> ((mtime in ns, size) or None if not readable, peers, error)
+_PEER_FILE_CACHE: Dict[str, Tuple[Optional[Tuple[int, int]], Dict[str, Tuple[str, int]], Optional[str]]] = {}
+
+_MONITORING_STATES = {'OK': 0, 'WARN': 1, 'CRIT': 2, 'UNKNOWN': 3}
+
+
+def _peer_state(value: Any) -> int:
+    if value in (None, ''):
+        return 2  # default of the rule
+    if isinstance(value, str) and value.upper() in _MONITORING_STATES:
+        return _MONITORING_STATES[value.upper()]
+    state = int(value)
+    if state not in (0, 1, 2, 3):
+        raise ValueError(f'invalid state {value!r}')
+    return state
+
+
+def _peers_from_json(data: Any) -> Tuple[Dict[str, Tuple[str, int]], List[str]]:
+    """
+    {"10.10.10.10": "alias", "10.10.10.11": ["alias", 1]} or
+    [{"neighbor": "10.10.10.10", "alias": "alias", "state": "WARN"}, ...]
+    Invalid entries are skipped and returned as errors.
+    """
+    peers = {}
+    errors = []
+    if isinstance(data, dict):
+        for item, value in data.items():
+            try:
+                peers[str(item)] = (value, 2) if isinstance(value, str) else (str(value[0]), _peer_state(value[1]))
+            except (IndexError, KeyError, TypeError, ValueError) as exc:
+                errors.append(f'{item}: {exc}')
+    elif isinstance(data, list):
+        for number, entry in enumerate(data, start=1):
+            try:
+                peers[str(entry['neighbor'])] = (str(entry['alias']), _peer_state(entry.get('state')))
+            except KeyError as exc:
+                errors.append(f'entry {number}: missing {exc}')
+            except (AttributeError, TypeError, ValueError) as exc:
+                errors.append(f'entry {number}: {exc}')
+    else:
+        errors.append('not a JSON object or list')
+    return peers, errors
+
+
+def _peers_from_csv(lines: Iterable[str]) -> Tuple[Dict[str, Tuple[str, int]], List[str]]:
+    """
+    neighbor,alias[,state if not found] per line, empty lines, comments (#) and a header line
+    starting with "neighbor" are skipped. Invalid lines are skipped and returned as errors.
+    """
+    import csv  # only needed for the optional peer file, not loaded with the plugin
+
+    peers = {}
+    errors = []
+    reader = csv.reader(lines)
+    for row in reader:
+        if not row or row[0].startswith('#') or row[0].strip().lower() == 'neighbor':
+            continue
+        if len(row) < 2:
+            errors.append(f'line {reader.line_num}: missing alias')
+            continue
+        try:
+            peers[row[0].strip()] = (row[1].strip(), _peer_state(row[2].strip() if len(row) > 2 else None))
+        except ValueError as exc:
+            errors.append(f'line {reader.line_num}: {exc}')
+    return peers, errors
+
+
+def _load_peer_file(path: str) -> Tuple[Dict[str, Tuple[str, int]], Optional[str]]:
+    """
+    Peers from a CSV or JSON (.json) file and an error text if the file or some entries are not
+    usable, relative paths are relative to the site directory. The result, including errors, is
+    cached, the file is only parsed again if its modification time or size has changed.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(os.environ.get('OMD_ROOT', ''), path)
+    try:
+        stat = os.stat(path)
+    except OSError as exc:
+        key = None
+        error = str(exc)
+    else:
+        key = (stat.st_mtime_ns, stat.st_size)
+    cached = _PEER_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+
+    peers: Dict[str, Tuple[str, int]] = {}
+    if key is not None:
+        try:
+            with open(path, encoding='utf-8', newline='') as file:
+                if path.endswith('.json'):
+                    peers, errors = _peers_from_json(json.load(file))
+                else:
+                    peers, errors = _peers_from_csv(file)
+        except (OSError, ValueError) as exc:  # not readable, not valid JSON or not UTF-8
+            error = str(exc)
+        else:
+            error = None
+            if errors:
+                more = ', ...' if len(errors) > 3 else ''
+                error = f'{len(errors)} invalid entries skipped ({", ".join(errors[:3])}{more})'
+    _PEER_FILE_CACHE[path] = (key, peers, error)
+    return peers, error
+
+
+def _file_peers(compiled: CompiledParams) -> Tuple[Dict[str, Tuple[str, int]], Optional[str]]:
+    if not compiled.peer_file:
+        return {}, None
+    peers, error = _load_peer_file(compiled.peer_file)
+    return peers, f'Peer file {compiled.peer_file}: {error}' if error else None
+
+
+def _lookup_peer(
+        compiled: CompiledParams,
+        file_peers: Mapping[str, Tuple[str, int]],
+        item: str,
+) -> Optional[Tuple[str, int]]:
+    """
+    Alias and state if not found of a neighbor, from the rule peer list, the peer file or the
+    alias templates per network, in this order.
+    """
+    peer = compiled.peers.get(item) or file_peers.get(item)
+    if peer is not None or compiled.peer_networks is None:
+        return peer
+    ip = split_context(item)[1].split('%', 1)[0]
+    template = compiled.peer_networks.get(ip)
+    if template is None:
+        return None
+    alias, not_found_state, valid_template = template
+    if valid_template:
+        alias = alias.format(ip=ip, item=item, octets=ip.split('.'))
+    return alias, not_found_state
+
+
+_COUNTER32 = 2 ** 32
+
+
+# more state changes of one neighbor per second are not plausible, such a delta is a counter reset
+_MAX_EVENTS_PER_SECOND = 100
+
+
+def _counter32_delta(last: int, value: int, seconds: float) -> Optional[int]:
+    """
+    Delta of an SNMP Counter32 of neighbor events. If the value is smaller than the last one, the
+    counter wrapped if the last value was in the upper half of the counter range and the delta is
+    plausible for the seconds in between. Otherwise the counter was reset (device reboot or neighbor
+    entry re-created) and None is returned.
+    """
+    if value >= last:
+        delta = value - last
+    elif last >= _COUNTER32 // 2:
+        delta = value + _COUNTER32 - last
+    else:
+        return None
+    return delta if delta <= seconds * _MAX_EVENTS_PER_SECOND else None
+
+
+def _events_delta(value_store, now: float, events: int) -> Tuple[float, Optional[int]]:
+    """
+    Returns the seconds since the last sample of ospfNbrEvents and the number of events since then.
+    The seconds are 0 if there is no usable last sample, the events are None if the counter was reset.
+    """
+    last = value_store.get('events')
+    value_store['events'] = (now, events)
+    if last is None or now <= last[0]:
+        return 0, 0
+    seconds = now - last[0]
+    return seconds, _counter32_delta(last[1], events, seconds)
+
+
+def _check_events_rate(seconds: float, delta: Optional[int], levels: Optional[Tuple[float, float]]) -> CheckResult:
+    if not seconds:
+        return
+    if delta is None:
+        yield Result(state=State.OK, notice='Events counter reset (device reboot or neighbor re-created)')
+        return
+    yield from check_levels(
+        value=delta * 60.0 / seconds,
+        levels_upper=levels,
+        metric_name='ospf_neighbor_ospf_events_rate',
+        render_func=lambda v: f'{v:.2f}/min',
+        label='Events',
+        notice_only=True,
+    )
+
+
+_HISTORY_MAX_ENTRIES = 32  # per neighbor
+_HISTORY_HOST_BUDGET = 16384  # for all neighbors of a host
+
 
+def _update_history(value_store, now: float, state: int, delta: Optional[int], neighbors: int) -> List[int]:
+    """
+    Bounded history of the state changes of a neighbor, kept flat in the value store as
+    [time, ospfNbrState, events, time, ospfNbrState, events, ...]. An entry is added only if the
+    state or the events counter changed since the last check, the oldest entries are dropped.
+    The entries per neighbor are limited so that all neighbors of a host together never keep more
+    than _HISTORY_HOST_BUDGET entries.
+    """
+    size = max(1, min(_HISTORY_MAX_ENTRIES, _HISTORY_HOST_BUDGET // max(neighbors, 1)))
+    history = value_store.get('history', [])
+    last_state = value_store.get('state')
+    value_store['state'] = state
+    if last_state is not None and (state != last_state or delta != 0):
+        # a counter reset means the neighbor entry was re-created, count it as one change at least
+        events = 1 if delta is None else max(delta, int(state != last_state))
+        history = history + [int(now), state, events]
+    value_store['history'] = history[-3 * size:]
+    return value_store['history']
+
+
+def _check_flapping(history: List[int], now: float, params: Mapping[str, Any]) -> CheckResult:
+    """
+    Counts the neighbor events (state changes) within the configured time window. The events
+    counter also reveals flaps between two checks, where the polled state did not change.
+    """
+    window = params['window']
+    changes = sum(history[index + 2] for index in range(0, len(history), 3) if history[index] >= now - window)
+    yield from check_levels(
+        value=changes,
+        levels_upper=params['levels'],
+        render_func=lambda v: '%d' % v,
+        label=f'State changes in last {render.timespan(window)}',
+        notice_only=True,
+    )
+
+
+def _check_lsretransqlen(value_store, now: float, lsretransqlen: int, params: Mapping[str, Any]) -> CheckResult:
+    """
+    Levels on the retransmission queue length. With 'average' the levels apply to an exponentially
+    weighted moving average, with 'sustained' only to a queue length at or above a level for at least
+    this time, without both to the current value. Both keep only a few floats per neighbor in the
+    value store, no metric history is read.
+    """
+    levels = params['levels']
+    if 'average' not in params and 'sustained' not in params:
+        yield from check_levels(
+            value=lsretransqlen,
+            levels_upper=levels,
+            render_func=lambda v: '%d' % v,
+            label='Retransmission queue length',
+            notice_only=True,
+        )
+        return
+
+    if 'average' in params:
+        average = get_average(value_store, 'lsretransqlen_average', now, lsretransqlen, params['average'] / 60.0)
+        yield from check_levels(
+            value=average,
+            levels_upper=levels,
+            metric_name='ospf_neighbor_ospf_retransmission_queue_length_average',
+            render_func=lambda v: f'{v:.1f}',
+            label=f'Retransmission queue length average ({render.timespan(params["average"])})',
+            notice_only=True,
+        )
+
+    if 'sustained' in params:
+        # start of the current period at or above the warning and the critical level, None if below
+        above = [
+            (now if since is None else since) if lsretransqlen >= level else None
+            for since, level in zip(value_store.get('lsretransqlen_above', (None, None)), levels)
+        ]
+        value_store['lsretransqlen_above'] = above
+        duration = params['sustained']
+        for state, since, level in [(State.CRIT, above[1], levels[1]), (State.WARN, above[0], levels[0])]:
+            if since is not None and now - since >= duration:
+                yield Result(
+                    state=state,
+                    notice=f'Retransmission queue length at or above {level} for {render.timespan(now - since)} '
+                           f'(allowed: {render.timespan(duration)})',
+                )
+                return
+        if above[0] is not None:
+            yield Result(
+                state=State.OK,
+                notice=f'Retransmission queue length at or above {levels[0]} for {render.timespan(now - above[0])}',
+            )
+
+
+# latest neighbor states of ospfNbrStateChange traps, one file per router ID, written by the
+# trap handler bin/ospf_neighbor_trap_bridge: {"<item>": [<time>, <state>, "<neighbor router ID>"], ...}
+_TRAP_CACHE_DIR = os.path.join(
+    os.environ['OMD_ROOT'], 'tmp', 'check_mk', 'ospf_neighbor', 'traps'
+) if 'OMD_ROOT' in os.environ else os.path.join(os.environ.get('TMPDIR', '/tmp'), 'ospf_neighbor', 'traps')
+
+_SPOOL_CACHE: Dict[str, Tuple[int, Any]] = {}  # path -> (mtime in ns, content)
+
+
+def _read_spool_file(path: str, max_age: float, now: float) -> Any:
+    """
+    The JSON content of a spool file, None if there is none or it is older than max_age.
+    The file is only read again if its modification time has changed.
+    """
     try:
-        neighbor = section[item]
-    except KeyError:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if now - stat.st_mtime > max_age:
+        return None
+    cached = _SPOOL_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns:
+        return cached[1]
+    try:
+        with open(path, encoding='utf-8') as file:
+            content = json.load(file)
+    except (OSError, ValueError):
+        return None
+    _SPOOL_CACHE[path] = (stat.st_mtime_ns, content)
+    return content
+
+
+def _trap_state(
+        value_store,
+        now: float,
+        router_id: str,
+        key: str,
+        neighbor: OspfNeighbor,
+        max_age: float,
+) -> Optional[Tuple[int, float]]:
+    """
+    The neighbor state and time of the latest trap, if the trap is not older than max_age and was
+    received after the polled state was first seen. A polled state is new if the state or the events
+    counter of the neighbor has changed, then it is newer than all traps received before.
+    """
+    polled = value_store.get('polled')
+    if polled is None or polled[0] != neighbor.events or polled[1] != neighbor.state:
+        polled = [neighbor.events, neighbor.state, now]
+        value_store['polled'] = polled
+
+    traps = _read_spool_file(os.path.join(_TRAP_CACHE_DIR, f'{router_id}.json'), max_age, now)
+    trap = traps.get(key) if isinstance(traps, dict) else None
+    if not trap:
+        return None
+    trap_time, state = trap[0], trap[1]
+    if trap_time <= polled[2] or now - trap_time > max_age:
+        return None
+    return state, trap_time
+
+
+def check_ospf_neighbor(
+        item,
+        params,
+        section_ospf_neighbor: Optional[OspfNeighborSection],
+        section_ospf_neighbor_details: Optional[Dict[str, OspfNeighborDetails]],
+        section_ospf_general: Optional[OspfGeneral],
+) -> CheckResult:
+    if not (_INSTRUMENTATION or params.get('instrumentation')):
+        yield from _check_ospf_neighbor(
+            item, params, section_ospf_neighbor, section_ospf_neighbor_details, section_ospf_general)
+        return
+
+    start = time.perf_counter()
+    yield from _check_ospf_neighbor(
+        item, params, section_ospf_neighbor, section_ospf_neighbor_details, section_ospf_general)
+    duration = time.perf_counter() - start
+    _LOGGER.debug('ospf_neighbor: checked item %s in %.6f s', item, duration)
+    yield Metric(value=duration, name='ospf_neighbor_check_duration')
+
+
+def _check_ospf_neighbor(
+        item,
+        params,
+        section_ospf_neighbor: Optional[OspfNeighborSection],
+        section_ospf_neighbor_details: Optional[Dict[str, OspfNeighborDetails]],
+        section_ospf_general: Optional[OspfGeneral],
+) -> CheckResult:
+    compiled = get_compiled_params(params)
+    if section_ospf_neighbor:
+        _export_once(section_ospf_neighbor)
+
+    not_found_state = compiled.state_not_found
+
+    file_peers, error = _file_peers(compiled)
+    if error:
+        yield Result(state=State.WARN, notice=error)
+
+    peer = _lookup_peer(compiled, file_peers, item)
+    if peer is not None:
+        neighbour_alias, not_found_state = peer
+        yield Result(state=State.OK, summary=f'[{neighbour_alias}]')
+
+    key = _get_neighbor_key(item, section_ospf_neighbor or OspfNeighborSection())
+    if key is None:
         yield Result(state=State(not_found_state), notice='Item not found in SNMP data')
         return
+    neighbor = section_ospf_neighbor[key]
 
     yield Result(state=State.OK, summary=f'Neighbor ID: {neighbor.rtrid}')
 
-    neighborstate.update(params.get('neighborstate', neighborstate))  # update neighborstatus with params
+    value_store = get_value_store()
+    now = time.time()
 
-    yield Result(state=State(neighborstate.get(neighbor.state, 3)), summary=f'Status: {ospf_nbr_state(neighbor.state)}')
+    trap = None
+    # the traps are recorded per router ID of the default OSPF instance
+    if 'traps' in params and section_ospf_general is not None and not split_context(key)[0]:
+        trap = _trap_state(value_store, now, section_ospf_general.router_id, key, neighbor, params['traps']['max_age'])
+    if trap is None:
+        yield Result(
+            state=State(compiled.neighborstate.get(neighbor.state, 3)),
+            summary=f'Status: {neighbor.state_text}',
+        )
+    else:
+        trap_state, trap_time = trap
+        yield Result(
+            state=State(compiled.neighborstate.get(trap_state, 3)),
+            summary=f'Status: {ospf_nbr_state(trap_state)} (SNMP trap {render.timespan(now - trap_time)} ago, '
+                    f'polled: {neighbor.state_text})',
+        )
 
     yield Metric(value=neighbor.events, name='ospf_neighbor_ospf_events')
     yield Metric(value=neighbor.lsretransqlen, name='ospf_neighbor_ospf_retransmission_queue_length')
 
-    for text, value in [
-        ('options', neighbor.options),
-        ('priority', neighbor.prio),
-        ('permanence', neighbor.permanence),
-        ('hello suppressed', neighbor.hellosup),
-        ('helper status', neighbor.helperstatus),
-        ('helper age', neighbor.helperage),
-        ('helper exit reason', neighbor.helperexitreason),
-    ]:
+    seconds, delta = _events_delta(value_store, now, neighbor.events)
+    yield from _check_events_rate(seconds, delta, params.get('events_rate'))
+
+    if 'flapping' in params:
+        history = _update_history(value_store, now, neighbor.state, delta, len(section_ospf_neighbor))
+        yield from _check_flapping(history, now, params['flapping'])
+    else:
+        # no flap detection, don't keep the history (i.e. of a removed rule) in the value store
+        value_store.pop('history', None)
+        value_store.pop('state', None)
+
+    if 'lsretransqlen' in params:
+        yield from _check_lsretransqlen(value_store, now, neighbor.lsretransqlen, params['lsretransqlen'])
+
+    attributes = [
+        ('options', neighbor.options_text),
+        ('priority', neighbor.prio_text),
+    ]
+    details = (section_ospf_neighbor_details or {}).get(key)
+    if details is not None:
+        attributes += [
+            ('permanence', details.permanence_text),
+            ('hello suppressed', details.hellosup_text),
+            ('helper status', details.helperstatus_text),
+            ('helper age', details.helperage_text),
+            ('helper exit reason', details.helperexitreason_text),
+        ]
+
+    yield from _check_attributes(value_store, now, attributes, params.get('long_output'))
+
+
+def check_ospfv3_neighbor(item, params, section: OspfNeighborSection) -> CheckResult:
+    yield from check_ospf_neighbor(item, params, section, None, None)
+
+
+def _check_attributes(
+        value_store,
+        now: float,
+        attributes: List[Tuple[str, str]],
+        params: Optional[Mapping[str, Any]],
+) -> CheckResult:
+    """
+    Static neighbor attributes as long output. In the mode 'changes' an attribute is only shown if
+    its value differs from the last check, or all attributes if the refresh interval has passed.
+    """
+    if params is not None and params['mode'] == 'changes':
+        values = tuple(value for _text, value in attributes)
+        last_values = value_store.get('attributes', ())
+        value_store['attributes'] = values
+        if now - value_store.get('attributes_shown', 0) < params['refresh'] and len(last_values) == len(values):
+            attributes = [attribute for attribute, last in zip(attributes, last_values) if attribute[1] != last]
+        else:
+            value_store['attributes_shown'] = now
+
+    for text, value in attributes:
         if value != '':
             yield Result(state=State.OK, notice=f'Neighbor {text}: {value}')
 
 
+def check_ospf_neighbor_summary(params, section: OspfNeighborSection) -> CheckResult:
+    compiled = get_compiled_params(params)
+    _export_once(section)
+
+    state_count = {}
+    events = 0
+    lsretransqlen = 0
+    for neighbor in section.values():
+        state_count[neighbor.state] = state_count.get(neighbor.state, 0) + 1
+        events += neighbor.events
+        lsretransqlen += neighbor.lsretransqlen
+
+    file_peers, error = _file_peers(compiled)
+    if error:
+        yield Result(state=State.WARN, notice=error)
+    peers = {**file_peers, **compiled.peers}
+    missing = [item for item in peers if _get_neighbor_key(item, section) is None]
+
+    summary = [f'Neighbors: {len(section)}'] + [
+        f'{ospf_nbr_state(st)}: {state_count[st]}' for st in sorted(state_count, reverse=True)
+    ]
+    if missing:
+        summary.append(f'not found: {len(missing)}')
+    yield Result(state=State.OK, summary=', '.join(summary))
+
+    for item, neighbor in section.items():
+        if neighbor.state == 8:  # full
+            continue
+        alias = peers.get(item) or peers.get(item.split('%', 1)[0]) or _lookup_peer(compiled, {}, item)
+        alias = f' [{alias[0]}]' if alias else ''
+        yield Result(
+            state=State(compiled.neighborstate.get(neighbor.state, 3)),
+            notice=f'Neighbor {item}{alias}: {neighbor.state_text}',
+        )
+
+    for item in missing:
+        alias, not_found_state = peers[item]
+        yield Result(state=State(not_found_state), notice=f'Neighbor {item} [{alias}]: not found in SNMP data')
+
+    yield Metric(value=len(section), name='ospf_neighbor_count')
+    yield Metric(value=state_count.get(8, 0), name='ospf_neighbor_count_full')
+    yield Metric(value=events, name='ospf_neighbor_ospf_events')
+    yield Metric(value=lsretransqlen, name='ospf_neighbor_ospf_retransmission_queue_length')
+
+    if _INSTRUMENTATION or params.get('instrumentation'):
+        yield from _check_instrumentation(section)
+
+
+def _check_instrumentation(section: Dict[str, OspfNeighbor]) -> CheckResult:
+    rows = getattr(section, 'rows', len(section))
+    parse_duration = getattr(section, 'parse_duration', 0.0)
+    section_size = _section_size(section)
+    yield Result(
+        state=State.OK,
+        notice=f'Parse function: {rows} rows in {parse_duration * 1000:.2f} ms, '
+               f'section size: {render.bytes(section_size)}',
+    )
+    yield Metric(value=rows, name='ospf_neighbor_rows')
+    yield Metric(value=parse_duration, name='ospf_neighbor_parse_duration')
+    yield Metric(value=section_size, name='ospf_neighbor_section_size')
+
+
+# spool for the adjacency correlation, one file per router ID with the neighbor table of the router
+_ADJACENCY_SPOOL_DIR = os.path.join(
+    os.environ['OMD_ROOT'], 'tmp', 'check_mk', 'ospf_neighbor', 'adjacency'
+) if 'OMD_ROOT' in os.environ else os.path.join(os.environ.get('TMPDIR', '/tmp'), 'ospf_neighbor', 'adjacency')
+
+
+def discovery_ospf_neighbor_adjacency(
+        params,
+        section_ospf_general: Optional[OspfGeneral],
+        section_ospf_neighbor: Optional[Dict[str, OspfNeighbor]],
+) -> DiscoveryResult:
+    if params.get('adjacency') and section_ospf_general is not None and section_ospf_neighbor:
+        yield Service()
+
+
+def _adjacency_path(router_id: str) -> str:
+    return os.path.join(_ADJACENCY_SPOOL_DIR, f'{router_id}.json')
+
+
+def _read_adjacency_entry(router_id: str, max_age: float, now: float) -> Optional[Dict[str, Any]]:
+    """
+    The spooled neighbor table of a router, None if there is none or it is older than max_age.
+    """
+    return _read_spool_file(_adjacency_path(router_id), max_age, now)
+
+
+def _write_adjacency_entry(router_id: str, entry: Dict[str, Any], max_age: float, now: float) -> None:
+    """
+    Updates the spool file of this router only if the neighbor table has changed, or after half
+    of max_age to keep it fresh. The file is replaced atomically, readers never see partial data.
+    """
+    if _read_adjacency_entry(router_id, max_age / 2, now) == entry:
+        return
+    os.makedirs(_ADJACENCY_SPOOL_DIR, exist_ok=True)
+    temp_path = os.path.join(_ADJACENCY_SPOOL_DIR, f'.{router_id}.{os.getpid()}.tmp')
+    try:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(entry, file, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_path, _adjacency_path(router_id))
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _adjacency_class(states: Iterable[int]) -> int:
+    # full and twoWay (DROther on broadcast networks) are established, all other states are not
+    return max(state if state in (4, 8) else 0 for state in states)
+
+
+def check_ospf_neighbor_adjacency(
+        params,
+        section_ospf_general: Optional[OspfGeneral],
+        section_ospf_neighbor: Optional[Dict[str, OspfNeighbor]],
+) -> CheckResult:
+    if section_ospf_general is None:
+        yield Result(state=State.UNKNOWN, summary='OSPF router ID not found in SNMP data')
+        return
+    router_id = section_ospf_general.router_id
+    now = time.time()
+    max_age = params['max_age']
+
+    neighbors: Dict[str, List[List[Any]]] = {}
+    for item, neighbor in (section_ospf_neighbor or {}).items():
+        if split_context(item)[0]:
+            continue  # other OSPF instance, not the one of the router ID
+        neighbors.setdefault(neighbor.rtrid, []).append([item, neighbor.state])
+    entry = {
+        'host': _current_host(),
+        'neighbors': {neighbor_id: sorted(adjacencies) for neighbor_id, adjacencies in neighbors.items()},
+    }
+    try:
+        _write_adjacency_entry(router_id, entry, max_age, now)
+    except OSError as exc:
+        yield Result(state=State.UNKNOWN, summary=f'Adjacency spool not writable: {exc}')
+
+    confirmed = 0
+    not_monitored = 0
+    problems = []
+    for neighbor_id, adjacencies in sorted(entry['neighbors'].items()):
+        remote = _read_adjacency_entry(neighbor_id, max_age, now)
+        if remote is None:
+            not_monitored += 1
+            continue
+        local_states = [state for _item, state in adjacencies]
+        remote_states = [state for _item, state in remote['neighbors'].get(router_id, [])]
+        text = (f'Neighbor {", ".join(item for item, _state in adjacencies)} (router ID {neighbor_id}): '
+                f'{", ".join(ospf_nbr_state(state) for state in local_states)} here')
+        remote_name = remote.get('host') or neighbor_id
+        if not remote_states:
+            problems.append((params['state_one_sided'], f'{text}, no adjacency on {remote_name}'))
+        elif _adjacency_class(local_states) != _adjacency_class(remote_states):
+            problems.append((
+                params['state_asymmetric'],
+                f'{text}, {", ".join(ospf_nbr_state(state) for state in remote_states)} on {remote_name}',
+            ))
+        else:
+            confirmed += 1
+
+    summary = [f'Router ID: {router_id}', f'neighbor routers: {len(neighbors)}', f'confirmed: {confirmed}']
+    if problems:
+        summary.append(f'one-sided/asymmetric: {len(problems)}')
+    if not_monitored:
+        summary.append(f'not monitored: {not_monitored}')
+    yield Result(state=State.OK, summary=', '.join(summary))
+    for state, text in problems:
+        yield Result(state=State(state), notice=text)
+
+
+def inventory_ospf_neighbor(
+        section_ospf_neighbor: Optional[Dict[str, OspfNeighbor]],
+        section_ospf_neighbor_details: Optional[Dict[str, OspfNeighborDetails]],
+) -> InventoryResult:
+    path = ['networking', 'ospf', 'neighbors']
+    section_ospf_neighbor_details = section_ospf_neighbor_details or {}
+    for item, neighbor in (section_ospf_neighbor or {}).items():
+        context, address = split_context(item)
+        address, _sep, address_less_index = address.partition('%')
+        key_columns = {
+            'neighbor_address': address,
+            'address_less_index': int(address_less_index or 0),
+        }
+        if context:
+            key_columns['context'] = context
+        inventory_columns = {
+            'router_id': neighbor.rtrid,
+            'options': neighbor.options_text,
+            'priority': neighbor.prio_text,
+        }
+        details = section_ospf_neighbor_details.get(item)
+        if details is not None:
+            inventory_columns.update({
+                'permanence': details.permanence_text,
+                'hello_suppressed': details.hellosup_text,
+                'helper_status': details.helperstatus_text,
+                'helper_exit_reason': details.helperexitreason_text,
+            })
+        yield TableRow(
+            path=path,
+            key_columns=key_columns,
+            inventory_columns={key: value for key, value in inventory_columns.items() if value != ''},
+            # changes every minute, kept out of the inventory history
+            status_columns={
+                'state': neighbor.state_text,
+            },
+        )
+
+
+def _detect_ospf_neighbor(admin_stat: str, neighbor_table: str):
+    """
+    Checks the scalar OSPF-MIB::ospfAdminStat (OSPFV3-MIB::ospfv3AdminStatus) first (one GET) and
+    only then confirms the neighbor table with a GETNEXT, so devices without OSPF are not walked into
+    the neighbor table.
+
+    Optional the environment variable OSPF_NEIGHBOR_SYS_OBJECT_IDS (comma separated list of
+    sysObjectID prefixes, i.e. ".1.3.6.1.4.1.9.,.1.3.6.1.4.1.2636.") restricts the detection to
+    these vendors. The sysObjectID is fetched by every SNMP scan anyway.
+    """
+    detect = all_of(
+        equals(admin_stat, '1'),  # enabled
+        exists(neighbor_table),
+    )
+    sys_object_ids = [oid.strip() for oid in os.environ.get('OSPF_NEIGHBOR_SYS_OBJECT_IDS', '').split(',')]
+    sys_object_ids = [oid for oid in sys_object_ids if oid]
+    if sys_object_ids:
+        detect = all_of(
+            any_of(*[startswith('.1.3.6.1.2.1.1.2.0', oid) for oid in sys_object_ids]),  # SNMPv2-MIB::sysObjectID
+            detect,
+        )
+    return detect
+
+
+_OSPF_NEIGHBOR_DETECT = _detect_ospf_neighbor(
+    '.1.3.6.1.2.1.14.1.2.0',  # OSPF-MIB::ospfAdminStat
+    '.1.3.6.1.2.1.14.10.1.3.*',  # OSPF-MIB::ospfNbrRtrId
+)
+_OSPFV3_NEIGHBOR_DETECT = _detect_ospf_neighbor(
+    '.1.3.6.1.2.1.191.1.1.2.0',  # OSPFV3-MIB::ospfv3AdminStatus
+    '.1.3.6.1.2.1.191.1.9.1.8.*',  # OSPFV3-MIB::ospfv3NbrState
+)
+
 register.snmp_section(
     name='ospf_neighbor',
     parse_function=parse_ospf_neighbor,
     fetch=SNMPTree(
         base='.1.3.6.1.2.1.14.10.1',  # OSPF-MIB::ospfNbrEntry
         oids=[
-            '1',  # ospfNbrIpAddr
+            OIDEnd(),  # ospfNbrIpAddr.ospfNbrAddressLessIndex
             '3',  # ospfNbrRtrId
             '4',  # ospfNbrOptions
             '5',  # ospfNbrPriority
             '6',  # ospfNbrStat
             '7',  # ospfNbrEvents
             '8',  # ospfNbrLSRetransQLen
+        ]
+    ),
+    detect=_OSPF_NEIGHBOR_DETECT,
+)
+
+register.snmp_section(
+    name='ospf_general',
+    parse_function=parse_ospf_general,
+    fetch=SNMPTree(
+        base='.1.3.6.1.2.1.14.1',  # OSPF-MIB::ospfGeneralGroup
+        oids=[
+            '1.0',  # ospfRouterId
+            '2.0',  # ospfAdminStat
+        ]
+    ),
+    detect=_OSPF_NEIGHBOR_DETECT,
+)
+
+# display only columns, many devices do not implement the graceful restart helper columns.
+# Can be switched off per host with the rule "Disabled and enabled sections (SNMP)".
+register.snmp_section(
+    name='ospf_neighbor_details',
+    parse_function=parse_ospf_neighbor_details,
+    fetch=SNMPTree(
+        base='.1.3.6.1.2.1.14.10.1',  # OSPF-MIB::ospfNbrEntry
+        oids=[
+            OIDEnd(),  # ospfNbrIpAddr.ospfNbrAddressLessIndex
             '10',  # ospfNbrPermanence
             '11',  # ospfNbrHelloSuppressed
             '12',  # ospfNbrRestartHelperStatus
@@ -275,16 +1613,121 @@ register.snmp_section(
             '14',  # ospfNbrRestartHelperExitReason
         ]
     ),
-    detect=exists('.1.3.6.1.2.1.14.10.1.1.*')
+    detect=_OSPF_NEIGHBOR_DETECT,
+)
+
+register.snmp_section(
+    name='ospfv3_neighbor',
+    parse_function=parse_ospfv3_neighbor,
+    fetch=SNMPTree(
+        base='.1.3.6.1.2.1.191.1.9.1',  # OSPFV3-MIB::ospfv3NbrEntry
+        oids=[
+            OIDEnd(),  # ospfv3NbrIfIndex.ospfv3NbrIfInstId.ospfv3NbrRtrId
+            '6',  # ospfv3NbrOptions
+            '7',  # ospfv3NbrPriority
+            '8',  # ospfv3NbrState
+            '9',  # ospfv3NbrEvents
+            '10',  # ospfv3NbrLsRetransQLen
+        ]
+    ),
+    detect=_OSPFV3_NEIGHBOR_DETECT,
+)
+
+# piggyback data of the special agent agent_ospf_neighbor, same columns as the SNMP sections
+register.agent_section(
+    name='ospf_neighbor_agent',
+    parsed_section_name='ospf_neighbor',
+    parse_function=parse_ospf_neighbor_agent,
+)
+
+register.agent_section(
+    name='ospf_neighbor_details_agent',
+    parsed_section_name='ospf_neighbor_details',
+    parse_function=parse_ospf_neighbor_details,
+)
+
+register.agent_section(
+    name='ospfv3_neighbor_agent',
+    parsed_section_name='ospfv3_neighbor',
+    parse_function=parse_ospfv3_neighbor,
+)
+
+register.agent_section(
+    name='ospf_general_agent',
+    parsed_section_name='ospf_general',
+    parse_function=parse_ospf_general,
 )
 
 register.check_plugin(
     name='ospf_neighbor',
+    sections=['ospf_neighbor', 'ospf_neighbor_details', 'ospf_general'],
     service_name='OSPF neighbor %s',
     discovery_function=discovery_ospf_neighbor,
     check_function=check_ospf_neighbor,
+    discovery_ruleset_name='ospf_neighbor_discovery',
+    discovery_default_parameters={
+        'mode': 'single',
+        'item': 'index',
+    },
     check_default_parameters={
         'state_not_found': 3,
     },
     check_ruleset_name='ospf_neighbor',
 )
+
+register.check_plugin(
+    name='ospfv3_neighbor',
+    sections=['ospfv3_neighbor'],
+    service_name='OSPFv3 neighbor %s',
+    discovery_function=discovery_ospfv3_neighbor,
+    check_function=check_ospfv3_neighbor,
+    discovery_ruleset_name='ospf_neighbor_discovery',
+    discovery_default_parameters={
+        'mode': 'single',
+        'item': 'index',
+    },
+    check_default_parameters={
+        'state_not_found': 3,
+    },
+    check_ruleset_name='ospf_neighbor',
+)
+
+register.check_plugin(
+    name='ospf_neighbor_summary',
+    sections=['ospf_neighbor'],
+    service_name='OSPF neighbors summary',
+    discovery_function=discovery_ospf_neighbor_summary,
+    discovery_ruleset_name='ospf_neighbor_discovery',
+    discovery_default_parameters={
+        'mode': 'single',
+        'item': 'index',
+    },
+    check_function=check_ospf_neighbor_summary,
+    check_default_parameters={},
+    check_ruleset_name='ospf_neighbor_summary',
+)
+
+register.inventory_plugin(
+    name='ospf_neighbor',
+    sections=['ospf_neighbor', 'ospf_neighbor_details'],
+    inventory_function=inventory_ospf_neighbor,
+)
+
+register.check_plugin(
+    name='ospf_neighbor_adjacency',
+    sections=['ospf_general', 'ospf_neighbor'],
+    service_name='OSPF adjacencies',
+    discovery_function=discovery_ospf_neighbor_adjacency,
+    discovery_ruleset_name='ospf_neighbor_discovery',
+    discovery_default_parameters={
+        'mode': 'single',
+        'item': 'index',
+    },
+    check_function=check_ospf_neighbor_adjacency,
+    check_default_parameters={
+        'max_age': 1800,
+        'state_one_sided': 1,
+        'state_asymmetric': 1,
+    },
+    check_ruleset_name='ospf_neighbor_adjacency',
+)
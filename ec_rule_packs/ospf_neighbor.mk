@@ -0,0 +1,42 @@
+{'disabled': False,
+ 'id': 'ospf_neighbor',
+ 'rules': [{'actions': [],
+            'actions_in_downtime': True,
+            'autodelete': False,
+            'cancel_action_phases': 'always',
+            'cancel_actions': [],
+            'comment': 'OSPF-TRAP-MIB::ospfNbrStateChange with ospfNbrState down(1) opens a critical event for '
+                       'the neighbor address, the trap with ospfNbrState full(8) of the same neighbor cancels it. '
+                       'Works with and without translation of the trap OIDs.',
+            'description': 'OSPF neighbor down',
+            'disabled': False,
+            'docu_url': '',
+            'drop': False,
+            'id': 'ospf_neighbor_down',
+            'invert_matching': False,
+            'match': '(?:ospfNbrIpAddr|1\\.3\\.6\\.1\\.2\\.1\\.14\\.10\\.1\\.1)\\.[0-9.]+:\\s*([0-9.]+)'
+                     '.*(?:ospfNbrState|1\\.3\\.6\\.1\\.2\\.1\\.14\\.10\\.1\\.6)\\.[0-9.]+:\\s*(?:down|1)\\b',
+            'match_application': '(?:ospfNbrStateChange|1\\.3\\.6\\.1\\.2\\.1\\.14\\.16\\.2\\.2)$',
+            'match_ok': '(?:ospfNbrIpAddr|1\\.3\\.6\\.1\\.2\\.1\\.14\\.10\\.1\\.1)\\.[0-9.]+:\\s*([0-9.]+)'
+                        '.*(?:ospfNbrState|1\\.3\\.6\\.1\\.2\\.1\\.14\\.10\\.1\\.6)\\.[0-9.]+:\\s*(?:full|8)\\b',
+            'set_text': 'OSPF neighbor \\1 down',
+            'sl': {'precedence': 'message', 'value': 0},
+            'state': 2},
+           {'actions': [],
+            'actions_in_downtime': True,
+            'autodelete': False,
+            'cancel_action_phases': 'always',
+            'cancel_actions': [],
+            'comment': 'The other state changes (attempt, init, 2-way, exchange, loading) are transitions, the '
+                       'current state of all neighbors is shown by the OSPF neighbor services.',
+            'description': 'OSPF neighbor state transitions',
+            'disabled': False,
+            'docu_url': '',
+            'drop': True,
+            'id': 'ospf_neighbor_transition',
+            'invert_matching': False,
+            'match': '',
+            'match_application': '(?:ospfNbrStateChange|1\\.3\\.6\\.1\\.2\\.1\\.14\\.16\\.2\\.2)$',
+            'sl': {'precedence': 'message', 'value': 0},
+            'state': 0}],
+ 'title': 'OSPF neighbor state changes (OSPF-TRAP-MIB)'}
@@ -9,15 +9,29 @@
 # metrics plugin for ospf_neighbor check
 #
 # 2023-04-22: moved to ~/local/lib/check_mk/gui/plugins/metrics
+# 2026-10-18: added metrics for the OSPF neighbors summary service
+#             added events per minute, perf-o-meter on events per minute
+#             added instrumentation metrics
+#             added moving average of the retransmission queue length
 
 from cmk.gui.i18n import _
 
 from cmk.gui.plugins.metrics.utils import (
     metric_info,
     graph_info,
-    perfometer_info
+    perfometer_info,
+    unit_info,
 )
 
+if '1/min' not in unit_info:
+    unit_info['1/min'] = {
+        'title': _('per minute'),
+        'description': _('Frequency (displayed in events/min)'),
+        'symbol': _('/min'),
+        'render': lambda v: '%.2f%s' % (v, _('/min')),
+        'js_render': 'v => v.toFixed(2) + "/min"',
+    }
+
 #####################################################################################################################
 #
 # define metrics for OSPF neighbor perfdata
@@ -30,12 +44,59 @@ metric_info['ospf_neighbor_ospf_events'] = {
     'color': '16/a',
 }
 
+metric_info['ospf_neighbor_ospf_events_rate'] = {
+    'title': _('Events'),
+    'unit': '1/min',
+    'color': '16/b',
+}
+
 metric_info['ospf_neighbor_ospf_retransmission_queue_length'] = {
     'title': _('Retransmission queue length'),
     'unit': 'count',
     'color': '36/a',
 }
 
+metric_info['ospf_neighbor_ospf_retransmission_queue_length_average'] = {
+    'title': _('Retransmission queue length (average)'),
+    'unit': 'count',
+    'color': '36/b',
+}
+
+metric_info['ospf_neighbor_count'] = {
+    'title': _('Neighbors'),
+    'unit': 'count',
+    'color': '26/a',
+}
+
+metric_info['ospf_neighbor_count_full'] = {
+    'title': _('Neighbors in state full'),
+    'unit': 'count',
+    'color': '21/a',
+}
+
+metric_info['ospf_neighbor_rows'] = {
+    'title': _('Rows in OSPF neighbor table'),
+    'unit': 'count',
+    'color': '46/a',
+}
+
+metric_info['ospf_neighbor_parse_duration'] = {
+    'title': _('Parse duration'),
+    'unit': 's',
+    'color': '31/a',
+}
+
+metric_info['ospf_neighbor_check_duration'] = {
+    'title': _('Check duration'),
+    'unit': 's',
+    'color': '33/a',
+}
+
+metric_info['ospf_neighbor_section_size'] = {
+    'title': _('Parsed section size'),
+    'unit': 'bytes',
+    'color': '41/a',
+}
 
 ######################################################################################################################
 #
@@ -50,20 +111,57 @@ graph_info['ospf_neighbor_ospf_events'] = {
     ],
 }
 
+graph_info['ospf_neighbor_ospf_events_rate'] = {
+    'title': _('OSPF neighbor events per minute'),
+    'metrics': [
+        ('ospf_neighbor_ospf_events_rate', 'area'),
+    ],
+    'scalars': [
+        'ospf_neighbor_ospf_events_rate:warn',
+        'ospf_neighbor_ospf_events_rate:crit',
+    ],
+}
+
 graph_info['ospf_neighbor_ospf_retransmission_queue_length'] = {
     'title': _('OSPF neighbor Retransmission queue length'),
     'metrics': [
         ('ospf_neighbor_ospf_retransmission_queue_length', 'area'),
+        ('ospf_neighbor_ospf_retransmission_queue_length_average', 'line'),
+    ],
+    'optional_metrics': [
+        'ospf_neighbor_ospf_retransmission_queue_length_average',
+    ],
+}
+
+graph_info['ospf_neighbor_parse_duration'] = {
+    'title': _('OSPF neighbor parse duration'),
+    'metrics': [
+        ('ospf_neighbor_parse_duration', 'area'),
+    ],
+}
+
+graph_info['ospf_neighbor_count'] = {
+    'title': _('OSPF neighbors'),
+    'metrics': [
+        ('ospf_neighbor_count', 'line'),
+        ('ospf_neighbor_count_full', 'area'),
     ],
 }
 ######################################################################################################################
 #
-# define perf-o-meter for OSPF neighbor events
+# define perf-o-meter for OSPF neighbor events per minute and the OSPF neighbors summary
 #
 ######################################################################################################################
 
+perfometer_info.append({
+    'type': 'logarithmic',
+    'metric': 'ospf_neighbor_ospf_events_rate',
+    'half_value': 1.0,
+    'exponent': 2.0,
+})
+
 perfometer_info.append({
     'type': 'linear',
-    'segments': ['ospf_neighbor_ospf_events'],
-    # 'total': 100,
+    'segments': ['ospf_neighbor_count_full'],
+    'total': 'ospf_neighbor_count',
 })
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Author: thl-cmk[at]outlook[dot]com
+# URL   : https://thl-cmk.hopto.org
+# Date  : 2026-10-18
+#
+# inventory view plugin for ospf_neighbor (display hints for Networking -> OSPF -> Neighbors)
+#
+
+from cmk.gui.i18n import _
+from cmk.gui.plugins.views.utils import (
+    inventory_displayhints,
+)
+from cmk.gui.plugins.views.inventory import (
+    declare_invtable_view,
+)
+
+inventory_displayhints.update({
+    '.networking.ospf.': {
+        'title': _('OSPF'),
+    },
+    '.networking.ospf.neighbors:': {
+        'title': _('Neighbors'),
+        'keyorder': [
+            'context',
+            'neighbor_address',
+            'address_less_index',
+            'router_id',
+            'state',
+            'priority',
+            'options',
+            'permanence',
+            'hello_suppressed',
+            'helper_status',
+            'helper_exit_reason',
+        ],
+        'view': 'invospfneighbor_of_host',
+    },
+    '.networking.ospf.neighbors:*.context': {'title': _('Context')},
+    '.networking.ospf.neighbors:*.neighbor_address': {'title': _('Neighbor address')},
+    '.networking.ospf.neighbors:*.address_less_index': {'title': _('Address-less index')},
+    '.networking.ospf.neighbors:*.router_id': {'title': _('Router ID')},
+    '.networking.ospf.neighbors:*.state': {'title': _('State')},
+    '.networking.ospf.neighbors:*.priority': {'title': _('Priority')},
+    '.networking.ospf.neighbors:*.options': {'title': _('Options')},
+    '.networking.ospf.neighbors:*.permanence': {'title': _('Permanence')},
+    '.networking.ospf.neighbors:*.hello_suppressed': {'title': _('Hello suppressed')},
+    '.networking.ospf.neighbors:*.helper_status': {'title': _('Helper status')},
+    '.networking.ospf.neighbors:*.helper_exit_reason': {'title': _('Helper exit reason')},
+})
+
+declare_invtable_view(
+    'invospfneighbor',
+    '.networking.ospf.neighbors:',
+    _('OSPF neighbor'),
+    _('OSPF neighbors'),
+)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Author: thl-cmk[at]outlook[dot]com
+# URL   : https://thl-cmk.hopto.org
+# Date  : 2026-10-18
+#
+# wato plugin for the special agent agent_ospf_neighbor
+#
+# 2026-10-18: added OSPFv3 and SNMP contexts
+#
+
+from cmk.gui.i18n import _
+from cmk.gui.valuespec import (
+    Dictionary,
+    FixedValue,
+    Float,
+    Hostname,
+    Integer,
+    ListOf,
+    ListOfStrings,
+    TextAscii,
+    Tuple,
+)
+
+from cmk.gui.plugins.wato.utils import (
+    HostRulespec,
+    IndividualOrStoredPassword,
+    rulespec_registry,
+)
+from cmk.gui.plugins.wato.special_agents.common import (
+    RulespecGroupDatasourceProgramsHardware,
+)
+
+
+def _valuespec_special_agents_ospf_neighbor():
+    return Dictionary(
+        title=_('OSPF neighbors via SNMP (piggyback)'),
+        help=_('Polls the OSPF neighbor table of many routers at the same time and creates piggyback data '
+               'for the routers. The routers need to be hosts in Checkmk with the piggyback data source. Disable '
+               'the SNMP section "ospf_neighbor" on the routers if they are also monitored via SNMP.'),
+        elements=[
+            ('targets',
+             ListOf(
+                 Tuple(
+                     orientation='horizontal',
+                     elements=[
+                         Hostname(
+                             title=_('Host name'),
+                             help=_('The name of the router host in Checkmk'),
+                         ),
+                         TextAscii(
+                             title=_('SNMP address'),
+                             help=_('IP address or DNS name of the router, optional with port (i.e. '
+                                    '"10.10.10.1:161"). Leave empty to use the host name.'),
+                             size=30,
+                         ),
+                     ]),
+                 title=_('Routers'),
+                 allow_empty=False,
+                 add_label=_('Add router'),
+             )),
+            ('community',
+             IndividualOrStoredPassword(
+                 title=_('SNMPv2c community'),
+                 allow_empty=False,
+             )),
+            ('port',
+             Integer(
+                 title=_('Default UDP port'),
+                 default_value=161,
+                 minvalue=1,
+                 maxvalue=65535,
+             )),
+            ('timeout',
+             Float(
+                 title=_('Timeout per request'),
+                 unit=_('seconds'),
+                 default_value=2.0,
+                 minvalue=0.1,
+             )),
+            ('retries',
+             Integer(
+                 title=_('Retries per request'),
+                 default_value=1,
+                 minvalue=0,
+             )),
+            ('target_timeout',
+             Float(
+                 title=_('Timeout per router'),
+                 help=_('Maximum time for all requests to one router. Routers not answering within this time '
+                        'get no piggyback data in this run.'),
+                 unit=_('seconds'),
+                 default_value=60.0,
+                 minvalue=1.0,
+             )),
+            ('max_concurrency',
+             Integer(
+                 title=_('Routers polled at the same time'),
+                 default_value=50,
+                 minvalue=1,
+             )),
+            ('max_repetitions',
+             Integer(
+                 title=_('GETBULK max-repetitions'),
+                 default_value=25,
+                 minvalue=1,
+                 maxvalue=100,
+             )),
+            ('details',
+             FixedValue(
+                 True,
+                 title=_('Fetch permanence, hello suppressed and helper status'),
+                 totext=_('fetch the columns of the section ospf_neighbor_details'),
+             )),
+            ('ospfv3',
+             FixedValue(
+                 True,
+                 title=_('Fetch the OSPFv3 neighbor table'),
+                 totext=_('walk OSPFV3-MIB::ospfv3NbrTable (service "OSPFv3 neighbor")'),
+             )),
+            ('contexts',
+             ListOfStrings(
+                 title=_('SNMP contexts (VRFs)'),
+                 help=_('Further OSPF instances of the routers, i.e. in VRFs. The tables of each context are '
+                        'walked in the same pass with the community "<community>@<context>" (community string '
+                        'indexing). The items of these neighbors have the context in front, i.e. '
+                        '"RED:10.10.10.10". Contexts not answering are reported on stderr and skipped.'),
+                 orientation='horizontal',
+                 allow_empty=False,
+             )),
+        ],
+        required_keys=['targets', 'community'],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupDatasourceProgramsHardware,
+        name='special_agents:ospf_neighbor',
+        valuespec=_valuespec_special_agents_ospf_neighbor,
+    ))
@@ -10,10 +10,29 @@
 # wato plugin for ospf_neighbor check
 #
 # 2023-04-22: moved to ~/local/lib/check_mk/gui/plugins/wato
+# 2026-10-18: added discovery rule and parameters for the OSPF neighbors summary service
+#             added levels on events per minute
+#             added flap detection
+#             added option to show static neighbor attributes only on change
+#             added instrumentation option
+#             added discovery filters on networks, router IDs, permanence and state
+#             added adjacency correlation option and parameters
+#             added peer file and alias templates per network
+#             added neighbor states from SNMP traps
+#             OSPFv3 neighbors and neighbors in SNMP contexts (item help, discovery)
+#             added levels on the retransmission queue length (moving average and/or sustained)
 
 from cmk.gui.i18n import _
 from cmk.gui.valuespec import (
+    Age,
     Dictionary,
+    DropdownChoice,
+    FixedValue,
+    Float,
+    Integer,
+    IPv4Network,
+    ListChoice,
+    ListOfStrings,
     TextAscii,
     ListOf,
     Tuple,
@@ -23,161 +42,368 @@ from cmk.gui.valuespec import (
 
 from cmk.gui.plugins.wato.utils import (
     CheckParameterRulespecWithItem,
+    CheckParameterRulespecWithoutItem,
+    HostRulespec,
     rulespec_registry,
+    RulespecGroupCheckParametersDiscovery,
     RulespecGroupCheckParametersNetworking,
 )
 
 
+def _element_state_not_found():
+    return ('state_not_found',
+            MonitoringState(
+                title=_('State to report if neighbor not found'),
+                help=_('Default monitoring state if the neighbor not found in the SNMP data. Default monitoring '
+                       'state is "UNKNOWN"'),
+                default_value=3,
+            ))
+
+
+def _element_neighborstate():
+    return ('neighborstate',
+            Dictionary(
+                title=_('State to report for OSPF neighbor state'),
+                help=_('Map each OSPF state to a CheckMK monitoring state'),
+                elements=[
+                    ('1',
+                     MonitoringState(
+                         title=_('1 - down'),
+                         help=_('This is the first OSPF neighbor state. It means that no information (hellos) has '
+                                'been received from this neighbor, but hello packets can still be sent to the '
+                                'neighbor in this state. During the fully adjacent neighbor state, if a router '
+                                'doesn\'t receive hello packet from a neighbor within the RouterDeadInterval time '
+                                '(RouterDeadInterval = 4*HelloInterval by default) or if the manually configured '
+                                'neighbor is being removed from the configuration, then the neighbor state changes '
+                                'from Full to Down. Default monitoring state is "CRIT"'),
+                         default_value=2,
+                     )),
+                    ('2',
+                     MonitoringState(
+                         title=_('2 - attempt'),
+                         help=_('This state is only valid for manually configured neighbors in an NBMA environment. '
+                                'In Attempt state, the router sends unicast hello packets every poll interval to the '
+                                'neighbor, from which hellos have not been received within the dead interval. '
+                                'Default monitoring state is "WARN"'),
+                         default_value=1,
+                     )),
+                    ('3',
+                     MonitoringState(
+                         title=_('3 - init'),
+                         help=_('This state specifies that the router has received a hello packet from its neighbor, '
+                                'but the receiving router\'s ID was not included in the hello packet. When a router '
+                                'receives a hello packet from a neighbor, it should list the sender\'s router ID in '
+                                'its hello packet as an acknowledgment that it received a valid hello packet. '
+                                'Default monitoring state is "WARN"'),
+                         default_value=1,
+                     )),
+                    ('4',
+                     MonitoringState(
+                         title=_('4 - twoWay'),
+                         help=_('This state designates that bi-directional communication has been established between '
+                                'two routers. Bi-directional means that each router has seen the other\'s hello '
+                                'packet. This state is attained when the router receiving the hello packet sees its '
+                                'own Router ID within the received hello packet\'s neighbor field. At this state, a '
+                                'router decides whether to become adjacent with this neighbor. On broadcast media '
+                                'and non-broadcast multiaccess networks, a router becomes full only with the '
+                                'designated router (DR) and the backup designated router (BDR); it stays in the 2-way '
+                                'state with all other neighbors. On Point-to-point and Point-to-multipoint networks, '
+                                'a router becomes full with all connected routers. At the end of this stage, the DR '
+                                'and BDR for broadcast and non-broadcast multiacess networks are elected. For more '
+                                'information on the DR election process, refer to DR Election. Note: Receiving a '
+                                'Database Descriptor (DBD) packet from a neighbor in the init state will also a cause '
+                                'a transition to 2-way state. Default monitoring state is "OK"'),
+                         default_value=0,
+                     )),
+                    ('5',
+                     MonitoringState(
+                         title=_('5 - exchangeStart'),
+                         help=_('Once the DR and BDR are elected, the actual process of exchanging link state '
+                                'information can start between the routers and their DR and BDR. In this state, '
+                                'the routers and their DR and BDR establish a master-slave relationship and choose '
+                                'the initial sequence number for adjacency formation. The router with the higher '
+                                'router ID becomes the master and starts the exchange, and as such, is the only '
+                                'router that can increment the sequence number. Note that one would logically '
+                                'conclude that the DR/BDR with the highest router ID will become the master during '
+                                'this process of master-slave relation. Remember that the DR/BDR election might be '
+                                'purely by virtue of a higher priority configured on the router instead of highest '
+                                'router ID. Thus, it is possible that a DR plays the role of slave. And also note '
+                                'that master/slave election is on a per-neighbor basis. Default monitoring state '
+                                'is "WARN"'),
+                         default_value=1,
+                     )),
+                    ('6',
+                     MonitoringState(
+                         title=_('6 - exchange'),
+                         help=_('In the exchange state, OSPF routers exchange database descriptor (DBD) packets. '
+                                'Database descriptors contain link-state advertisement (LSA) headers only and '
+                                'describe the contents of the entire link-state database. Each DBD packet has a '
+                                'sequence number which can be incremented only by master which is explicitly '
+                                'acknowledged by slave. Routers also send link-state request packets and link-state '
+                                'update packets (which contain the entire LSA) in this state. The contents of the '
+                                'DBD received are compared to the information contained in the routers link-state '
+                                'database to check if new or more current link-state information is available with '
+                                'the neighbor. Default monitoring state is "WARN"'),
+                         default_value=1,
+                     )),
+                    ('7',
+                     MonitoringState(
+                         title=_('7 - loading'),
+                         help=_('In this state, the actual exchange of link state information occurs. Based on the '
+                                'information provided by the DBDs, routers send link-state request packets. The '
+                                'neighbor then provides the requested link-state information in link-state update '
+                                'packets. During the adjacency, if a router receives an outdated or missing LSA, it '
+                                'requests that LSA by sending a link-state request packet. All link-state update '
+                                'packets are acknowledged. Default monitoring state is "WARN"'),
+                         default_value=1,
+                     )),
+                    ('8',
+                     MonitoringState(
+                         title=_('8 - full'),
+                         help=_('In this state, routers are fully adjacent with each other. All the router and '
+                                'network LSAs are exchanged and the routers databases are fully synchronized. Full '
+                                'is the normal state for an OSPF router. If a router is stuck in another state, '
+                                'it\'s an indication that there are problems in forming adjacencies. The only '
+                                'exception to this is the 2-way state, which is normal in a broadcast network. '
+                                'Routers achieve the full state with their DR and BDR only. Neighbors always see '
+                                'each other as 2-way. Default monitoring state is "OK"'),
+                         default_value=0,
+                     )),
+                ])
+            )
+
+
+def _element_peer_list():
+    return ('peer_list',
+            ListOf(
+                Tuple(
+                    title=_('OSPF Neighbors'),
+                    elements=[
+                        TextUnicode(
+                            title=_('OSPF Neighbor IP address'),
+                            help=_(
+                                'The configured value must match a OSPF Neighbor item reported by the monitored '
+                                'device. For example: "10.10.10.10" or "10.10.10.10%12" for an address-less '
+                                'neighbor'),
+                            allow_empty=False,
+                        ),
+                        TextUnicode(
+                            title=_('OSPF Neighbor Alias'),
+                            help=_('You can configure an individual alias here for the OSPF Neighbor matching '
+                                   'the text configured in the "OSPF Neighbor IP address" field. The alias will '
+                                   'be shown in the check info (i.e. [your alias])'),
+                            allow_empty=False,
+                        ),
+                        MonitoringState(
+                            default_value=2,
+                            title=_('State if not found'),
+                            help=_('You can configure an individual state if the OSPF Neighbor matching the text '
+                                   'configured in the "OSPF Neighbor IP address" field is not found. '
+                                   'Default monitoring state is "CRIT".')
+                        )]),
+                add_label=_('Add OSPF Neighbor'),
+                movable=False,
+                title=_('OSPF Neighbor specific configuration'),
+            ))
+
+
+def _element_peer_file():
+    return ('peer_file',
+            TextAscii(
+                title=_('OSPF Neighbors from file'),
+                help=_('CSV or JSON file with OSPF Neighbors for large numbers of neighbors, relative to the site '
+                       'directory (i.e. "etc/ospf_neighbor/peers.csv") or absolute. CSV: one neighbor per line as '
+                       '"neighbor,alias,state if not found" (state 0..3 or OK/WARN/CRIT/UNKNOWN, optional, default '
+                       'CRIT). JSON (file name ending with .json): {"10.10.10.10": "alias", "10.10.10.11": ["alias", '
+                       '1]}. The file is read again only after it has changed. Invalid entries are skipped and '
+                       'reported as warning. The neighbor specific configuration of this rule takes precedence.'),
+                size=60,
+                allow_empty=False,
+            ))
+
+
+def _element_peer_networks():
+    return ('peer_networks',
+            ListOf(
+                Tuple(
+                    orientation='horizontal',
+                    elements=[
+                        IPv4Network(
+                            title=_('Network'),
+                        ),
+                        TextUnicode(
+                            title=_('Alias template'),
+                            help=_('Alias of the OSPF Neighbors in this network. "{ip}" is replaced by the neighbor '
+                                   'IP address, "{item}" by the item and "{octets[3]}" by the last octet of the IP '
+                                   'address (i.e. "core-{octets[3]}").'),
+                            allow_empty=False,
+                        ),
+                        MonitoringState(
+                            default_value=2,
+                            title=_('State if not found'),
+                        ),
+                    ]),
+                title=_('OSPF Neighbor configuration per network'),
+                help=_('For OSPF Neighbors without specific configuration or entry in the file. The longest '
+                       'matching network is used.'),
+                add_label=_('Add network'),
+                movable=False,
+            ))
+
+
+def _element_events_rate():
+    return ('events_rate',
+            Tuple(
+                title=_('Levels on OSPF neighbor events'),
+                help=_('Upper levels on the rate of the OSPF neighbor events (state changes or errors of the '
+                       'neighbor relationship) per minute.'),
+                elements=[
+                    Float(title=_('Warning at'), unit=_('events/min'), default_value=1.0),
+                    Float(title=_('Critical at'), unit=_('events/min'), default_value=5.0),
+                ],
+            ))
+
+
+def _element_flapping():
+    return ('flapping',
+            Dictionary(
+                title=_('Flap detection'),
+                help=_('Counts the state changes of the OSPF neighbor within a time window. The count is based '
+                       'on the OSPF neighbor events counter, so an adjacency bouncing between two checks is '
+                       'detected even if the polled state is the same. Note that one flap of an adjacency '
+                       '(full -> down -> full) counts about eight state changes. The history is kept in a small '
+                       'fixed size buffer per neighbor.'),
+                elements=[
+                    ('window',
+                     Age(
+                         title=_('Time window'),
+                         default_value=900,
+                     )),
+                    ('levels',
+                     Tuple(
+                         title=_('Levels on state changes within the time window'),
+                         elements=[
+                             Integer(title=_('Warning at'), default_value=10),
+                             Integer(title=_('Critical at'), default_value=30),
+                         ],
+                     )),
+                ],
+                required_keys=['window', 'levels'],
+            ))
+
+
+def _element_lsretransqlen():
+    return ('lsretransqlen',
+            Dictionary(
+                title=_('Levels on the retransmission queue length'),
+                help=_('Upper levels on the number of LSAs waiting for acknowledgement by the neighbor (link state '
+                       'retransmission queue). The queue fills up for a short time during the database exchange, '
+                       'so the levels can be applied to a moving average and/or only if the queue length stays at '
+                       'or above a level for some time. Both keep a few values per neighbor, no metric history is '
+                       'read. Without these options the levels apply to the current queue length.'),
+                elements=[
+                    ('levels',
+                     Tuple(
+                         title=_('Levels on the queue length'),
+                         elements=[
+                             Integer(title=_('Warning at'), default_value=10),
+                             Integer(title=_('Critical at'), default_value=100),
+                         ],
+                     )),
+                    ('average',
+                     Age(
+                         title=_('Apply the levels to the moving average over'),
+                         help=_('Exponentially weighted moving average. After this time the weight of the older '
+                                'samples is halved.'),
+                         default_value=900,
+                     )),
+                    ('sustained',
+                     Age(
+                         title=_('Apply the levels only if exceeded for at least'),
+                         default_value=600,
+                     )),
+                ],
+                required_keys=['levels'],
+            ))
+
+
+def _element_long_output():
+    return ('long_output',
+            Dictionary(
+                title=_('Static neighbor attributes in the long output'),
+                help=_('The options, priority, permanence, hello suppressed and graceful restart helper attributes '
+                       'of a neighbor rarely change. To reduce the size of the check results, these attributes can '
+                       'be shown only if they differ from the last check. All attributes are shown again after '
+                       'the refresh interval.'),
+                elements=[
+                    ('mode',
+                     DropdownChoice(
+                         title=_('Show attributes'),
+                         choices=[
+                             ('always', _('On every check')),
+                             ('changes', _('Only on change')),
+                         ],
+                         default_value='changes',
+                     )),
+                    ('refresh',
+                     Age(
+                         title=_('Refresh interval'),
+                         help=_('Show all attributes at least once in this interval.'),
+                         default_value=86400,
+                     )),
+                ],
+                required_keys=['mode', 'refresh'],
+            ))
+
+
+def _element_traps():
+    return ('traps',
+            Dictionary(
+                title=_('Neighbor states from SNMP traps'),
+                help=_('Uses the neighbor state of OSPF-TRAP-MIB::ospfNbrStateChange traps if a trap was received '
+                       'after the last change of the polled neighbor table. The traps are recorded by the trap '
+                       'handler ~/local/bin/ospf_neighbor_trap_bridge of snmptrapd. With this, a down adjacency is '
+                       'reported on the next check of the neighbor, the SNMP polling interval of the router can '
+                       'be increased. Needs the OSPF router ID of the router (section ospf_general).'),
+                elements=[
+                    ('max_age',
+                     Age(
+                         title=_('Maximum age of a trap'),
+                         help=_('Older traps are ignored, the polled state is used.'),
+                         default_value=900,
+                     )),
+                ],
+                required_keys=['max_age'],
+            ))
+
+
+def _element_instrumentation(help_text):
+    return ('instrumentation',
+            FixedValue(
+                True,
+                title=_('Instrumentation'),
+                help=help_text,
+                totext=_('enabled'),
+            ))
+
+
 def _parameter_valuespec_ospf_neighbor():
     return Dictionary(
         elements=[
-            ('state_not_found',
-             MonitoringState(
-                 title=_('State to report if neighbor not found'),
-                 help=_('Default monitoring state if the neighbor not found in the SNMP data. Default monitoring '
-                        'state is "UNKNOWN"'),
-                 default_value=3,
-             )),
-            ('neighborstate',
-             Dictionary(
-                 title=_('State to report for OSPF neighbor state'),
-                 help=_('Map each OSPF state to a CheckMK monitoring state'),
-                 elements=[
-                     ('1',
-                      MonitoringState(
-                          title=_('1 - down'),
-                          help=_('This is the first OSPF neighbor state. It means that no information (hellos) has '
-                                 'been received from this neighbor, but hello packets can still be sent to the '
-                                 'neighbor in this state. During the fully adjacent neighbor state, if a router '
-                                 'doesn\'t receive hello packet from a neighbor within the RouterDeadInterval time '
-                                 '(RouterDeadInterval = 4*HelloInterval by default) or if the manually configured '
-                                 'neighbor is being removed from the configuration, then the neighbor state changes '
-                                 'from Full to Down. Default monitoring state is "CRIT"'),
-                          default_value=2,
-                      )),
-                     ('2',
-                      MonitoringState(
-                          title=_('2 - attempt'),
-                          help=_('This state is only valid for manually configured neighbors in an NBMA environment. '
-                                 'In Attempt state, the router sends unicast hello packets every poll interval to the '
-                                 'neighbor, from which hellos have not been received within the dead interval. '
-                                 'Default monitoring state is "WARN"'),
-                          default_value=1,
-                      )),
-                     ('3',
-                      MonitoringState(
-                          title=_('3 - init'),
-                          help=_('This state specifies that the router has received a hello packet from its neighbor, '
-                                 'but the receiving router\'s ID was not included in the hello packet. When a router '
-                                 'receives a hello packet from a neighbor, it should list the sender\'s router ID in '
-                                 'its hello packet as an acknowledgment that it received a valid hello packet. '
-                                 'Default monitoring state is "WARN"'),
-                          default_value=1,
-                      )),
-                     ('4',
-                      MonitoringState(
-                          title=_('4 - twoWay'),
-                          help=_('This state designates that bi-directional communication has been established between '
-                                 'two routers. Bi-directional means that each router has seen the other\'s hello '
-                                 'packet. This state is attained when the router receiving the hello packet sees its '
-                                 'own Router ID within the received hello packet\'s neighbor field. At this state, a '
-                                 'router decides whether to become adjacent with this neighbor. On broadcast media '
-                                 'and non-broadcast multiaccess networks, a router becomes full only with the '
-                                 'designated router (DR) and the backup designated router (BDR); it stays in the 2-way '
-                                 'state with all other neighbors. On Point-to-point and Point-to-multipoint networks, '
-                                 'a router becomes full with all connected routers. At the end of this stage, the DR '
-                                 'and BDR for broadcast and non-broadcast multiacess networks are elected. For more '
-                                 'information on the DR election process, refer to DR Election. Note: Receiving a '
-                                 'Database Descriptor (DBD) packet from a neighbor in the init state will also a cause '
-                                 'a transition to 2-way state. Default monitoring state is "OK"'),
-                          default_value=0,
-                      )),
-                     ('5',
-                      MonitoringState(
-                          title=_('5 - exchangeStart'),
-                          help=_('Once the DR and BDR are elected, the actual process of exchanging link state '
-                                 'information can start between the routers and their DR and BDR. In this state, '
-                                 'the routers and their DR and BDR establish a master-slave relationship and choose '
-                                 'the initial sequence number for adjacency formation. The router with the higher '
-                                 'router ID becomes the master and starts the exchange, and as such, is the only '
-                                 'router that can increment the sequence number. Note that one would logically '
-                                 'conclude that the DR/BDR with the highest router ID will become the master during '
-                                 'this process of master-slave relation. Remember that the DR/BDR election might be '
-                                 'purely by virtue of a higher priority configured on the router instead of highest '
-                                 'router ID. Thus, it is possible that a DR plays the role of slave. And also note '
-                                 'that master/slave election is on a per-neighbor basis. Default monitoring state '
-                                 'is "WARN"'),
-                          default_value=1,
-                      )),
-                     ('6',
-                      MonitoringState(
-                          title=_('6 - exchange'),
-                          help=_('In the exchange state, OSPF routers exchange database descriptor (DBD) packets. '
-                                 'Database descriptors contain link-state advertisement (LSA) headers only and '
-                                 'describe the contents of the entire link-state database. Each DBD packet has a '
-                                 'sequence number which can be incremented only by master which is explicitly '
-                                 'acknowledged by slave. Routers also send link-state request packets and link-state '
-                                 'update packets (which contain the entire LSA) in this state. The contents of the '
-                                 'DBD received are compared to the information contained in the routers link-state '
-                                 'database to check if new or more current link-state information is available with '
-                                 'the neighbor. Default monitoring state is "WARN"'),
-                          default_value=1,
-                      )),
-                     ('7',
-                      MonitoringState(
-                          title=_('7 - loading'),
-                          help=_('In this state, the actual exchange of link state information occurs. Based on the '
-                                 'information provided by the DBDs, routers send link-state request packets. The '
-                                 'neighbor then provides the requested link-state information in link-state update '
-                                 'packets. During the adjacency, if a router receives an outdated or missing LSA, it '
-                                 'requests that LSA by sending a link-state request packet. All link-state update '
-                                 'packets are acknowledged. Default monitoring state is "WARN"'),
-                          default_value=1,
-                      )),
-                     ('8',
-                      MonitoringState(
-                          title=_('8 - full'),
-                          help=_('In this state, routers are fully adjacent with each other. All the router and '
-                                 'network LSAs are exchanged and the routers databases are fully synchronized. Full '
-                                 'is the normal state for an OSPF router. If a router is stuck in another state, '
-                                 'it\'s an indication that there are problems in forming adjacencies. The only '
-                                 'exception to this is the 2-way state, which is normal in a broadcast network. '
-                                 'Routers achieve the full state with their DR and BDR only. Neighbors always see '
-                                 'each other as 2-way. Default monitoring state is "OK"'),
-                          default_value=0,
-                      )),
-                 ])
-             ),
-            ('peer_list',
-             ListOf(
-                 Tuple(
-                     title=_('OSPF Neighbors'),
-                     elements=[
-                         TextUnicode(
-                             title=_('OSPF Neighbor IP address'),
-                             help=_(
-                                 'The configured value must match a OSPF Neighbor item reported by the monitored '
-                                 'device. For example: "10.10.10.10"'),
-                             allow_empty=False,
-                         ),
-                         TextUnicode(
-                             title=_('OSPF Neighbor Alias'),
-                             help=_('You can configure an individual alias here for the OSPF Neighbor matching '
-                                    'the text configured in the "OSPF Neighbor IP address" field. The alias will '
-                                    'be shown in the check info (i.e. [your alias])'),
-                             allow_empty=False,
-                         ),
-                         MonitoringState(
-                             default_value=2,
-                             title=_('State if not found'),
-                             help=_('You can configure an individual state if the OSPF Neighbor matching the text '
-                                    'configured in the "OSPF Neighbor IP address" field is not found. '
-                                    'Default monitoring state is "CRIT".')
-                         )]),
-                 add_label=_('Add OSPF Neighbor'),
-                 movable=False,
-                 title=_('OSPF Neighbor specific configuration'),
-             )),
+            _element_state_not_found(),
+            _element_neighborstate(),
+            _element_peer_list(),
+            _element_peer_file(),
+            _element_peer_networks(),
+            _element_events_rate(),
+            _element_flapping(),
+            _element_lsretransqlen(),
+            _element_long_output(),
+            _element_traps(),
+            _element_instrumentation(_(
+                'Measures the duration of the check for each neighbor and adds it as metric. The duration is also '
+                'written to the debug log. Can be enabled for all hosts with the environment variable '
+                'OSPF_NEIGHBOR_INSTRUMENTATION=1 in the site.')),
         ],
     )
 
@@ -186,8 +412,190 @@ rulespec_registry.register(
     CheckParameterRulespecWithItem(
         check_group_name='ospf_neighbor',
         group=RulespecGroupCheckParametersNetworking,
-        item_spec=lambda: TextAscii(title=_('OSPF Neighbor IP address'), ),
+        item_spec=lambda: TextAscii(
+            title=_('OSPF Neighbor IP address'),
+            help=_('The IP address of the neighbor, for address-less neighbors followed by "%" and the interface '
+                   'index (i.e. "10.10.10.10%12"). For OSPFv3 neighbors the router ID of the neighbor followed by '
+                   '"%" and the interface index. Neighbors in other SNMP contexts (VRFs) polled by the special agent '
+                   'have the context in front (i.e. "RED:10.10.10.10")'),
+        ),
         match_type='dict',
         parameter_valuespec=_parameter_valuespec_ospf_neighbor,
         title=lambda: _('OSPF neighbor'),
     ))
+
+
+def _parameter_valuespec_ospf_neighbor_summary():
+    return Dictionary(
+        elements=[
+            _element_neighborstate(),
+            _element_peer_list(),
+            _element_peer_file(),
+            _element_peer_networks(),
+            _element_instrumentation(_(
+                'Shows the number of rows, the duration of the parse function and the size of the parsed section '
+                'of the OSPF neighbor table, as metrics too. Can be enabled for all hosts with the environment '
+                'variable OSPF_NEIGHBOR_INSTRUMENTATION=1 in the site.')),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithoutItem(
+        check_group_name='ospf_neighbor_summary',
+        group=RulespecGroupCheckParametersNetworking,
+        match_type='dict',
+        parameter_valuespec=_parameter_valuespec_ospf_neighbor_summary,
+        title=lambda: _('OSPF neighbors summary'),
+    ))
+
+
+def _parameter_valuespec_ospf_neighbor_adjacency():
+    return Dictionary(
+        elements=[
+            ('max_age',
+             Age(
+                 title=_('Maximum age of the neighbor tables of other routers'),
+                 help=_('Each router writes its neighbor table to a spool in the site, indexed by its OSPF router ID. '
+                        'Neighbor tables older than this are ignored, the neighbor router counts as not monitored.'),
+                 default_value=1800,
+             )),
+            ('state_one_sided',
+             MonitoringState(
+                 title=_('State if the neighbor router has no adjacency to this router'),
+                 default_value=1,
+             )),
+            ('state_asymmetric',
+             MonitoringState(
+                 title=_('State if the adjacency is established on one side only'),
+                 help=_('i.e. full on this router, but exchange on the neighbor router. full and twoWay count as '
+                        'established.'),
+                 default_value=1,
+             )),
+        ],
+    )
+
+
+rulespec_registry.register(
+    CheckParameterRulespecWithoutItem(
+        check_group_name='ospf_neighbor_adjacency',
+        group=RulespecGroupCheckParametersNetworking,
+        match_type='dict',
+        parameter_valuespec=_parameter_valuespec_ospf_neighbor_adjacency,
+        title=lambda: _('OSPF adjacencies'),
+    ))
+
+
+def _element_network_filter(name, title, help_text):
+    return (name,
+            ListOfStrings(
+                title=title,
+                help=help_text,
+                valuespec=IPv4Network(),
+                orientation='horizontal',
+            ))
+
+
+def _valuespec_ospf_neighbor_discovery():
+    return Dictionary(
+        title=_('OSPF neighbor discovery'),
+        elements=[
+            ('mode',
+             DropdownChoice(
+                 title=_('Services to create'),
+                 help=_('Create one service per OSPF neighbor, one summary service for all OSPF neighbors of the '
+                        'host, or both. On hosts with a large number of neighbors the summary service reduces the '
+                        'number of services, RRD files and check results to one. The summary service covers the '
+                        'OSPFv2 neighbors, OSPFv3 neighbors get one service per neighbor (not in the mode '
+                        '"summary").'),
+                 choices=[
+                     ('single', _('One service per OSPF neighbor')),
+                     ('summary', _('One summary service for all OSPF neighbors')),
+                     ('both', _('Both, per neighbor and summary services')),
+                 ],
+                 default_value='single',
+             )),
+            ('item',
+             DropdownChoice(
+                 title=_('Item for address-less neighbors'),
+                 help=_('The item of an OSPF neighbor is its IP address. Neighbors on unnumbered links (address-less '
+                        'neighbors) can share one IP address, so by default the interface index is appended to the '
+                        'IP address of these neighbors (i.e. "10.10.10.10%12"). Use the IP address only to keep the '
+                        'service names discovered with older versions of this plugin. In this case address-less '
+                        'neighbors with the same IP address are merged into one service.'),
+                 choices=[
+                     ('index', _('IP address, with interface index for address-less neighbors')),
+                     ('ip', _('IP address only (compatibility)')),
+                 ],
+                 default_value='index',
+             )),
+            _element_network_filter(
+                'include_networks',
+                _('Only discover neighbors in networks'),
+                _('Discover only neighbors with an IP address in one of these networks (i.e. "10.0.0.0/8").'),
+            ),
+            _element_network_filter(
+                'exclude_networks',
+                _('Do not discover neighbors in networks'),
+                _('Skip neighbors with an IP address in one of these networks.'),
+            ),
+            _element_network_filter(
+                'include_router_ids',
+                _('Only discover neighbors with router ID in networks'),
+                _('Discover only neighbors with a router ID in one of these networks.'),
+            ),
+            _element_network_filter(
+                'exclude_router_ids',
+                _('Do not discover neighbors with router ID in networks'),
+                _('Skip neighbors with a router ID in one of these networks.'),
+            ),
+            ('permanence',
+             ListChoice(
+                 title=_('Only discover neighbors with permanence'),
+                 help=_('Discover only neighbors learned dynamically or configured statically. This filter is '
+                        'ignored if the device does not report the permanence of its neighbors.'),
+                 choices=[
+                     (1, _('dynamic')),
+                     (2, _('permanent')),
+                 ],
+                 default_value=[1, 2],
+             )),
+            ('states',
+             ListChoice(
+                 title=_('Only discover neighbors in state'),
+                 help=_('Discover only neighbors in one of these OSPF states at the time of the discovery, i.e. '
+                        'skip neighbors in state down.'),
+                 choices=[
+                     (1, _('down')),
+                     (2, _('attempt')),
+                     (3, _('init')),
+                     (4, _('twoWay')),
+                     (5, _('exchangeStart')),
+                     (6, _('exchange')),
+                     (7, _('loading')),
+                     (8, _('full')),
+                 ],
+                 default_value=[2, 3, 4, 5, 6, 7, 8],
+             )),
+            ('adjacency',
+             FixedValue(
+                 True,
+                 title=_('Correlate adjacencies across routers'),
+                 help=_('Creates the service "OSPF adjacencies". It compares the neighbor table of this router with '
+                        'the neighbor tables of its neighbor routers monitored in the same site and reports '
+                        'adjacencies that are one-sided or established on one side only. Needs the OSPF router ID '
+                        '(SNMP section ospf_general).'),
+                 totext=_('create the service OSPF adjacencies'),
+             )),
+        ],
+        required_keys=['mode'],
+    )
+
+
+rulespec_registry.register(
+    HostRulespec(
+        group=RulespecGroupCheckParametersDiscovery,
+        match_type='dict',
+        name='ospf_neighbor_discovery',
+        valuespec=_valuespec_ospf_neighbor_discovery,
+    ))
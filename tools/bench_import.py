@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Import time benchmark for the ospf_neighbor plugin modules outside a Checkmk site. Each
+# module is imported in a fresh interpreter (with the stand-ins of cmk_api_stub.py and
+# cmk_gui_stub.py), reported are the import time, the modules it pulls in additionally and
+# for the wato plugins the time to build the valuespecs (done by Checkmk only when the rule
+# editor is opened).
+#
+# The byte code of the modules is cached (one warm up run), the standard library modules
+# given with --preload are imported before, as they are already loaded in the Checkmk
+# processes (check helpers, GUI) when the plugins are loaded.
+#
+# usage: tools/bench_import.py [--repeat 20] [--preload logging,json,re]
+#
+
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+PLUGINS = [
+    'agent_based/ospf_neighbor.py',
+    'gui/wato/ospf_neighbor.py',
+    'gui/wato/agent_ospf_neighbor.py',
+    'gui/metrics/ospf_neighbor.py',
+    'gui/views/inv_ospf_neighbor.py',
+]
+
+
+# runs in a fresh interpreter: import one plugin module and build its valuespecs. Only the
+# modules needed for the measurement are imported before, so the imports of the plugin show up.
+_CHILD = """
+import importlib, sys, time
+from importlib.util import module_from_spec, spec_from_file_location
+from cmk_api_stub import install, load_plugin
+from cmk_gui_stub import RULESPECS, install_gui
+
+install()
+install_gui()
+plugin, path, preload = sys.argv[1:]
+for name in filter(None, preload.split(',')):
+    importlib.import_module(name)
+modules_before = set(sys.modules)
+start = time.perf_counter()
+if plugin.startswith('agent_based/'):
+    load_plugin(plugin[12:-3])
+else:
+    spec = spec_from_file_location('gui_plugin', path)
+    spec.loader.exec_module(module_from_spec(spec))
+import_time = time.perf_counter() - start
+new_modules = sorted(name for name in set(sys.modules) - modules_before if not name.startswith('cmk'))
+
+start = time.perf_counter()
+for rulespec in RULESPECS.values():
+    rulespec.valuespec
+valuespec_time = time.perf_counter() - start
+print(repr({
+    'import': import_time,
+    'valuespecs': valuespec_time if RULESPECS else None,
+    'rulespecs': len(RULESPECS),
+    'modules': new_modules,
+}))
+"""
+
+
+def _run_child(plugin: str, preload: str) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    output = subprocess.run(
+        [sys.executable, '-c', _CHILD, plugin, str(REPO_DIR / plugin), preload],
+        check=True,
+        stdout=subprocess.PIPE,
+        cwd=Path(__file__).resolve().parent,
+        env=env,
+        universal_newlines=True,
+    ).stdout
+    return ast.literal_eval(output)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20, help='fresh interpreters per module (default: 20)')
+    parser.add_argument('--preload', default='logging,json,re,ipaddress',
+                        help='comma separated modules imported before the plugin (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    print(f'{"module":<34} {"import ms":>10} {"min ms":>8} {"rulespecs":>9} {"valuespecs ms":>14}  imports')
+    for plugin in PLUGINS:
+        _run_child(plugin, args.preload)  # warm up, writes the byte code cache
+        runs = [_run_child(plugin, args.preload) for _ in range(args.repeat)]
+        imports = [run['import'] * 1000 for run in runs]
+        valuespecs = [run['valuespecs'] * 1000 for run in runs if run['valuespecs'] is not None]
+        print(f'{plugin:<34} {statistics.median(imports):>10.2f} {min(imports):>8.2f} {runs[0]["rulespecs"]:>9} '
+              f'{statistics.median(valuespecs) if valuespecs else 0:>14.3f}  {" ".join(runs[0]["modules"])}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Benchmark for the ospf_neighbor plugin outside a Checkmk site. Reports throughput,
+# per item latency and peak memory for parse, discovery and a full host check pass
+# (all neighbor services and the summary service) on synthetic neighbor tables.
+#
+# usage: tools/bench_ospf_neighbor.py [--sizes 10,100,1000,10000] [--repeat 3] [--peers 1.0]
+#
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from cmk_api_stub import install, load_plugin, set_value_store
+from ospf_nbr_table import generate_details_string_table, generate_string_table
+
+
+def _best_of(repeat: int, function: Callable[[], Any]) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(function: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _check_params(items: List[str], peers: float) -> Dict[str, Any]:
+    return {
+        'state_not_found': 3,
+        'peer_list': [(item, f'peer {index}', 2) for index, item in enumerate(items[:int(len(items) * peers)])],
+    }
+
+
+def bench(plugin: Any, size: int, repeat: int, peers: float) -> List[Tuple[str, int, float, int]]:
+    string_table = generate_string_table(size)
+    details_string_table = generate_details_string_table(size)
+    section = plugin.parse_ospf_neighbor(string_table)
+    details = plugin.parse_ospf_neighbor_details(details_string_table)
+    discovery_params = {'mode': 'both'}
+    items = [service.item for service in plugin.discovery_ospf_neighbor(discovery_params, section, details, None)]
+    params = _check_params(items, peers)
+    # in a site every service gets its own (equal) parameter object and value store
+    item_params = [(item, dict(params), {}) for item in items]
+    summary_params = {'peer_list': params['peer_list']}
+
+    def parse() -> None:
+        plugin.parse_ospf_neighbor(string_table)
+        plugin.parse_ospf_neighbor_details(details_string_table)
+
+    def discovery() -> None:
+        list(plugin.discovery_ospf_neighbor(discovery_params, section, details, None))
+        list(plugin.discovery_ospf_neighbor_summary(discovery_params, section))
+
+    def check() -> None:
+        for item, item_param, value_store in item_params:
+            set_value_store(value_store)
+            list(plugin.check_ospf_neighbor(item, item_param, section, details, None))
+        list(plugin.check_ospf_neighbor_summary(summary_params, section))
+
+    results = []
+    for name, function in [('parse', parse), ('discovery', discovery), ('check', check)]:
+        results.append((name, size, _best_of(repeat, function), _peak_memory(function)))
+    return results
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='10,100,1000,10000',
+                        help='comma separated list of neighbor table sizes (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per stage, best is reported')
+    parser.add_argument('--peers', type=float, default=1.0,
+                        help='size of the peer_list relative to the neighbor table (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    install()
+    plugin = load_plugin('ospf_neighbor')
+
+    print(f'{"stage":<10} {"rows":>8} {"total ms":>10} {"rows/s":>12} {"us/item":>9} {"peak KiB":>10}')
+    for size in [int(size) for size in args.sizes.split(',')]:
+        for name, rows, duration, peak in bench(plugin, size, args.repeat, args.peers):
+            print(f'{name:<10} {rows:>8} {duration * 1000:>10.2f} {rows / duration:>12.0f} '
+                  f'{duration / rows * 1e6:>9.2f} {peak / 1024:>10.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
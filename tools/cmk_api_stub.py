@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Minimal stand-in for the parts of the Checkmk agent based API v1 used by the
+# ospf_neighbor plugins. Allows to import and run the plugins outside a Checkmk
+# site (benchmarks, offline replay of SNMP walks).
+#
+# usage:
+#   from cmk_api_stub import install, load_plugin
+#   install()
+#   ospf_neighbor = load_plugin('ospf_neighbor')
+#
+
+import sys
+from enum import IntEnum
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping, NamedTuple, Optional, Tuple
+
+AGENT_BASED_DIR = Path(__file__).resolve().parent.parent / 'agent_based'
+AGENT_BASED_PACKAGE = 'cmk.base.plugins.agent_based'
+
+# registered plugins, by kind and name
+REGISTRY: Dict[str, Dict[str, Dict[str, Any]]] = {
+    'agent_section': {},
+    'snmp_section': {},
+    'check_plugin': {},
+    'inventory_plugin': {},
+}
+
+
+class State(IntEnum):
+    OK = 0
+    WARN = 1
+    CRIT = 2
+    UNKNOWN = 3
+
+    @classmethod
+    def worst(cls, *states: 'State') -> 'State':
+        if cls.CRIT in states:
+            return cls.CRIT
+        return cls(max(states))
+
+
+class Result(NamedTuple):
+    state: State
+    summary: str
+    details: str
+
+    @classmethod
+    def create(cls, *, state: State, summary: Optional[str] = None, notice: Optional[str] = None,
+               details: Optional[str] = None) -> 'Result':
+        if (summary is None) == (notice is None):
+            raise TypeError('Result needs exactly one of summary or notice')
+        if summary is not None:
+            return cls(State(state), summary, details or summary)
+        return cls(State(state), '', details or notice)
+
+
+class Metric(NamedTuple):
+    name: str
+    value: float
+    levels: Optional[Tuple[float, float]] = None
+    boundaries: Optional[Tuple[Optional[float], Optional[float]]] = None
+
+
+class Service(NamedTuple):
+    item: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    labels: Optional[List[Any]] = None
+
+
+class IgnoreResults(NamedTuple):
+    value: str = ''
+
+
+class IgnoreResultsError(RuntimeError):
+    pass
+
+
+class GetRateError(RuntimeError):
+    pass
+
+
+class OIDEnd(NamedTuple):
+    pass
+
+
+class SNMPTree(NamedTuple):
+    base: str
+    oids: List[Any]
+
+
+class Attributes(NamedTuple):
+    path: List[str]
+    inventory_attributes: Dict[str, Any] = {}
+    status_attributes: Dict[str, Any] = {}
+
+
+class TableRow(NamedTuple):
+    path: List[str]
+    key_columns: Dict[str, Any]
+    inventory_columns: Dict[str, Any] = {}
+    status_columns: Dict[str, Any] = {}
+
+
+def _detect(kind: str) -> Callable[..., Tuple[Any, ...]]:
+    return lambda *args: (kind,) + args
+
+
+class _Register:
+    @staticmethod
+    def _add(kind: str, kwargs: Dict[str, Any]) -> None:
+        REGISTRY[kind][kwargs['name']] = kwargs
+
+    def agent_section(self, **kwargs: Any) -> None:
+        self._add('agent_section', kwargs)
+
+    def snmp_section(self, **kwargs: Any) -> None:
+        self._add('snmp_section', kwargs)
+
+    def check_plugin(self, **kwargs: Any) -> None:
+        self._add('check_plugin', kwargs)
+
+    def inventory_plugin(self, **kwargs: Any) -> None:
+        self._add('inventory_plugin', kwargs)
+
+
+_value_store: MutableMapping[str, Any] = {}
+
+
+def get_value_store() -> MutableMapping[str, Any]:
+    return _value_store
+
+
+def set_value_store(value_store: MutableMapping[str, Any]) -> None:
+    """
+    Select the value store returned by get_value_store (one per host/service in a real site).
+    """
+    global _value_store
+    _value_store = value_store
+
+
+def get_rate(value_store: MutableMapping[str, Any], key: str, time: float, value: float, *,
+             raise_overflow: bool = False) -> float:
+    last = value_store.get(key)
+    value_store[key] = (time, value)
+    if last is None or last[0] >= time:
+        raise GetRateError(f'Initialized: {key!r}')
+    rate = (value - last[1]) / (time - last[0])
+    if raise_overflow and rate < 0:
+        raise GetRateError(f'Value overflow: {key!r}')
+    return rate
+
+
+def get_average(value_store: MutableMapping[str, Any], key: str, time: float, value: float,
+                backlog_minutes: float) -> float:
+    """
+    Exponentially weighted moving average, the weight of the old average is halved after backlog_minutes.
+    """
+    last = value_store.get(key)
+    if last is None or len(last) != 3:
+        value_store[key] = (time, time, value)
+        return value
+    start_time, last_time, average = last
+    if time <= last_time:
+        return average
+    weight = 0.5 ** ((time - last_time) / (backlog_minutes * 60.0))
+    average = average * weight + value * (1 - weight)
+    value_store[key] = (start_time, time, average)
+    return average
+
+
+def check_levels(value: float, *, levels_upper: Optional[Tuple[float, float]] = None,
+                 levels_lower: Optional[Tuple[float, float]] = None, metric_name: Optional[str] = None,
+                 render_func: Optional[Callable[[float], str]] = None, label: Optional[str] = None,
+                 boundaries: Optional[Tuple[Optional[float], Optional[float]]] = None,
+                 notice_only: bool = False) -> Iterable[Any]:
+    render_func = render_func or (lambda v: '%.2f' % v)
+    text = f'{label}: {render_func(value)}' if label else render_func(value)
+    state = State.OK
+    if levels_upper is not None:
+        warn, crit = levels_upper
+        if value >= crit:
+            state = State.CRIT
+        elif value >= warn:
+            state = State.WARN
+        if state != State.OK:
+            text += f' (warn/crit at {render_func(warn)}/{render_func(crit)})'
+    if levels_lower is not None and state == State.OK:
+        warn, crit = levels_lower
+        if value < crit:
+            state = State.CRIT
+        elif value < warn:
+            state = State.WARN
+        if state != State.OK:
+            text += f' (warn/crit below {render_func(warn)}/{render_func(crit)})'
+    if notice_only:
+        yield Result.create(state=state, notice=text)
+    else:
+        yield Result.create(state=state, summary=text)
+    if metric_name:
+        yield Metric(metric_name, value, levels_upper, boundaries)
+
+
+def _bytes(value: float) -> str:
+    for unit, size in [('GiB', 1024 ** 3), ('MiB', 1024 ** 2), ('KiB', 1024)]:
+        if value >= size:
+            return f'{value / size:.2f} {unit}'
+    return f'{value:.0f} B'
+
+
+def _timespan(seconds: float) -> str:
+    for unit, size in [('d', 86400), ('h', 3600), ('m', 60)]:
+        if seconds >= size:
+            return f'{seconds / size:.0f} {unit}'
+    return f'{seconds:.0f} s'
+
+
+def _module(name: str, **attributes: Any) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is None:
+        module = ModuleType(name)
+        sys.modules[name] = module
+        parent, _, child = name.rpartition('.')
+        if parent:
+            setattr(sys.modules[parent], child, module)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    return module
+
+
+def install(agent_based_dir: Path = AGENT_BASED_DIR) -> None:
+    """
+    Register the stand-in modules in sys.modules. The package cmk.base.plugins.agent_based
+    points to the plugin directory of this repository.
+    """
+    for name in ['cmk', 'cmk.base', 'cmk.base.plugins']:
+        _module(name, __path__=[])
+    _module(AGENT_BASED_PACKAGE, __path__=[str(agent_based_dir)])
+    _module(f'{AGENT_BASED_PACKAGE}.agent_based_api', __path__=[])
+    _module(
+        f'{AGENT_BASED_PACKAGE}.agent_based_api.v1',
+        __path__=[],
+        Attributes=Attributes,
+        GetRateError=GetRateError,
+        IgnoreResults=IgnoreResults,
+        IgnoreResultsError=IgnoreResultsError,
+        Metric=Metric,
+        OIDEnd=OIDEnd,
+        Result=Result.create,
+        Service=Service,
+        SNMPTree=SNMPTree,
+        State=State,
+        TableRow=TableRow,
+        all_of=_detect('all_of'),
+        check_levels=check_levels,
+        any_of=_detect('any_of'),
+        contains=_detect('contains'),
+        equals=_detect('equals'),
+        exists=_detect('exists'),
+        startswith=_detect('startswith'),
+        get_average=get_average,
+        get_rate=get_rate,
+        get_value_store=get_value_store,
+        register=_Register(),
+    )
+    _module(
+        f'{AGENT_BASED_PACKAGE}.agent_based_api.v1.render',
+        bytes=_bytes,
+        timespan=_timespan,
+    )
+    _module(
+        f'{AGENT_BASED_PACKAGE}.agent_based_api.v1.type_defs',
+        CheckResult=Iterable[Any],
+        DiscoveryResult=Iterable[Service],
+        InventoryResult=Iterable[Any],
+        StringTable=List[List[str]],
+    )
+
+
+def load_plugin(name: str) -> ModuleType:
+    """
+    Import the agent based plugin module agent_based/<name>.py (install() must be called first).
+    """
+    module_name = f'{AGENT_BASED_PACKAGE}.{name}'
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    __import__(module_name)
+    return sys.modules[module_name]
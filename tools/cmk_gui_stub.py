@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Minimal stand-in for the parts of the Checkmk GUI API (Checkmk 2.1) used by the wato,
+# metrics and views plugins of ospf_neighbor. Allows to import the GUI plugins outside a
+# Checkmk site, i.e. to measure their import time (see bench_import.py).
+#
+# usage:
+#   from cmk_gui_stub import RULESPECS, install_gui
+#   install_gui()
+#
+
+import sys
+from types import ModuleType
+from typing import Any, Dict, List
+
+# registered rulespecs, by name
+RULESPECS: Dict[str, Any] = {}
+
+# arguments of declare_invtable_view
+DECLARED_VIEWS: List[Any] = []
+
+# number of valuespecs created, by class name
+VALUESPECS_CREATED: Dict[str, int] = {}
+
+_VALUESPEC_NAMES = [
+    'Age', 'Alternative', 'Checkbox', 'Dictionary', 'DropdownChoice', 'FixedValue', 'Float', 'Hostname',
+    'Integer', 'IPv4Network', 'ListChoice', 'ListOf', 'ListOfStrings', 'MonitoringState', 'Percentage',
+    'TextAscii', 'TextInput', 'TextUnicode', 'Tuple',
+]
+
+_RULESPEC_GROUPS = [
+    'RulespecGroupCheckParametersDiscovery',
+    'RulespecGroupCheckParametersNetworking',
+    'RulespecGroupDatasourceProgramsHardware',
+]
+
+
+class _ValueSpec:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        VALUESPECS_CREATED[type(self).__name__] = VALUESPECS_CREATED.get(type(self).__name__, 0) + 1
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _Rulespec:
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+
+    @property
+    def name(self) -> str:
+        if 'check_group_name' in self.kwargs:
+            return f'checkgroup_parameters:{self.kwargs["check_group_name"]}'
+        return self.kwargs['name']
+
+    @property
+    def valuespec(self) -> Any:
+        """
+        Builds the valuespec like the rule editor does.
+        """
+        factory = self.kwargs.get('parameter_valuespec') or self.kwargs['valuespec']
+        return factory()
+
+
+class _RulespecRegistry:
+    def register(self, rulespec: _Rulespec) -> None:
+        RULESPECS[rulespec.name] = rulespec
+
+
+def _translate(text: str) -> str:
+    return text
+
+
+def _declare_invtable_view(*args: Any) -> None:
+    DECLARED_VIEWS.append(args)
+
+
+def _module(name: str, **attributes: Any) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is None:
+        module = ModuleType(name)
+        module.__path__ = []  # type: ignore[attr-defined]
+        sys.modules[name] = module
+        parent, _, child = name.rpartition('.')
+        if parent:
+            setattr(_module(parent), child, module)
+    for key, value in attributes.items():
+        setattr(module, key, value)
+    return module
+
+
+def install_gui() -> None:
+    """
+    Register the stand-in modules of the Checkmk GUI in sys.modules.
+    """
+    _module('cmk.gui.i18n', _=_translate)
+    _module('cmk.gui.valuespec', **{name: type(name, (_ValueSpec,), {}) for name in _VALUESPEC_NAMES})
+    _module(
+        'cmk.gui.plugins.wato.utils',
+        CheckParameterRulespecWithItem=type('CheckParameterRulespecWithItem', (_Rulespec,), {}),
+        CheckParameterRulespecWithoutItem=type('CheckParameterRulespecWithoutItem', (_Rulespec,), {}),
+        HostRulespec=type('HostRulespec', (_Rulespec,), {}),
+        IndividualOrStoredPassword=type('IndividualOrStoredPassword', (_ValueSpec,), {}),
+        rulespec_registry=_RulespecRegistry(),
+        **{name: type(name, (), {}) for name in _RULESPEC_GROUPS},
+    )
+    _module(
+        'cmk.gui.plugins.wato.special_agents.common',
+        **{name: type(name, (), {}) for name in _RULESPEC_GROUPS},
+    )
+    _module(
+        'cmk.gui.plugins.metrics.utils',
+        metric_info={},
+        graph_info={},
+        perfometer_info=[],
+        unit_info={},
+    )
+    _module('cmk.gui.plugins.views.utils', inventory_displayhints={})
+    _module('cmk.gui.plugins.views.inventory', declare_invtable_view=_declare_invtable_view)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Generator for synthetic OSPF-MIB::ospfNbrTable string tables as fetched by the
+# ospf_neighbor SNMP section.
+#
+
+import random
+from typing import List
+
+# ospfNbrState and its share in the generated table
+STATE_WEIGHTS = [
+    ('8', 80),  # full
+    ('4', 10),  # twoWay
+    ('1', 3),  # down
+    ('2', 1),  # attempt
+    ('3', 1),  # init
+    ('5', 2),  # exchangeStart
+    ('6', 2),  # exchange
+    ('7', 1),  # loading
+]
+
+# ospfNbrOptions as returned for the OCTET STRING (one character)
+OPTIONS = ['\x02', '\x42', '\x12', '\x52', '\x08', '\x0a', '\x00', '\x03']
+
+
+def neighbor_ip(index: int) -> str:
+    return f'10.{(index >> 16) & 0xff}.{(index >> 8) & 0xff}.{index & 0xff}'
+
+
+def _generate_rows(count: int, seed: int) -> List[List[str]]:
+    rnd = random.Random(seed)
+    states = rnd.choices(
+        [state for state, _weight in STATE_WEIGHTS],
+        weights=[weight for _state, weight in STATE_WEIGHTS],
+        k=count,
+    )
+    rows = []
+    for index in range(count):
+        # about half of the devices do not implement the graceful restart helper columns
+        if rnd.random() < 0.5:
+            helper = ['', '', '']
+        else:
+            helper = [rnd.choice(['1', '2']), str(rnd.randint(0, 120)), str(rnd.randint(1, 5))]
+        # every 50th neighbor is address-less, sharing the address of the previous neighbor
+        if index % 50 == 49:
+            oid_end = f'{neighbor_ip(index - 1)}.{rnd.randint(1, 4096)}'
+        else:
+            oid_end = f'{neighbor_ip(index)}.0'
+        rows.append([
+            oid_end,  # ospfNbrIpAddr.ospfNbrAddressLessIndex
+            f'172.{(index >> 16) & 0xff}.{(index >> 8) & 0xff}.{index & 0xff}',  # ospfNbrRtrId
+            rnd.choice(OPTIONS),  # ospfNbrOptions
+            str(rnd.choice([0, 1, 1, 1, 100, 255])),  # ospfNbrPriority
+            states[index],  # ospfNbrState
+            str(rnd.randint(0, 5000)),  # ospfNbrEvents
+            str(rnd.choice([0] * 9 + [rnd.randint(1, 200)])),  # ospfNbrLSRetransQLen
+            rnd.choice(['1', '1', '1', '2']),  # ospfNbrPermanence
+            rnd.choice(['2', '2', '2', '1']),  # ospfNbrHelloSuppressed
+        ] + helper)  # ospfNbrRestartHelperStatus, ospfNbrRestartHelperAge, ospfNbrRestartHelperExitReason
+    return rows
+
+
+def generate_string_table(count: int, seed: int = 0) -> List[List[str]]:
+    """
+    Returns the string table of the section ospf_neighbor for count neighbors with mixed states
+    and options. The output is reproducible for a given seed.
+    """
+    return [row[:7] for row in _generate_rows(count, seed)]
+
+
+def generate_details_string_table(count: int, seed: int = 0) -> List[List[str]]:
+    """
+    Returns the string table of the section ospf_neighbor_details matching generate_string_table.
+    """
+    return [row[:1] + row[7:] for row in _generate_rows(count, seed)]
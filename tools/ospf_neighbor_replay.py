@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Offline replay of SNMP walks through the ospf_neighbor plugins. Runs detection, parse,
+# discovery and check for each host outside a Checkmk site, the hosts are spread across
+# a process pool.
+#
+# The walks can be in the format of "snmpwalk -ObentU" (see CONTRIBUTING.md) or in the
+# format of the Checkmk stored walks (~/var/check_mk/snmpwalks). One file per host, the
+# host name is the file name without the extension.
+#
+# The parameters are given as python literal (or JSON) file with the ruleset names as keys,
+# i.e. {'ospf_neighbor': {'state_not_found': 2}, 'ospf_neighbor_discovery': {'mode': 'both'}}
+#
+# usage: tools/ospf_neighbor_replay.py [--params rules.py] [--jobs 8] [--json] walk_or_dir [...]
+#
+
+import argparse
+import ast
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from cmk_api_stub import AGENT_BASED_DIR, REGISTRY, OIDEnd, Service, install, load_plugin, set_value_store
+
+Walk = Dict[str, str]  # OID -> value
+
+_TYPE_PREFIXES = [
+    'INTEGER: ', 'IpAddress: ', 'Counter32: ', 'Counter64: ', 'Gauge32: ', 'Unsigned32: ', 'OID: ',
+    'Network Address: ',
+]
+
+
+def _decode_value(value: str) -> str:
+    """
+    Value of a snmpwalk line as Checkmk passes it in the string table.
+    """
+    if value.startswith('Hex-STRING: '):
+        return bytes.fromhex(value[12:]).decode('latin-1')
+    if value.startswith('STRING: '):
+        value = value[8:]
+    elif value.startswith('Timeticks: ('):
+        return value[12:value.index(')')]
+    else:
+        for prefix in _TYPE_PREFIXES:
+            if value.startswith(prefix):
+                return value[len(prefix):]
+    if len(value) > 1 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def read_walk(path: Path, prefixes: Tuple[str, ...]) -> Walk:
+    """
+    Stream parses a walk file and keeps only the OIDs below one of the prefixes.
+    """
+    walk = {}
+    with path.open(encoding='utf-8', errors='replace') as file:
+        for line in file:
+            if not line.startswith('.'):
+                continue  # continuation of a multi line value
+            if ' = ' in line:
+                oid, value = line.rstrip('\n').split(' = ', 1)
+                value = _decode_value(value)
+            else:
+                oid, _, value = line.rstrip('\n').partition(' ')
+                if len(value) > 1 and value[0] == value[-1] == '"':
+                    value = value[1:-1]
+            if oid.startswith(prefixes):
+                walk[oid] = value
+    return walk
+
+
+def _oid_key(oid: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in oid.strip('.').split('.'))
+
+
+def _walk_prefixes() -> Tuple[str, ...]:
+    prefixes = ['.1.3.6.1.2.1.1.2.0']  # sysObjectID for detections
+    for section in REGISTRY['snmp_section'].values():
+        prefixes.append(section['fetch'].base + '.')
+        prefixes.extend(oid.rstrip('.*') for oid in _detect_oids(section['detect']))
+    return tuple(prefixes)
+
+
+def _detect_oids(detect: Tuple[Any, ...]) -> Iterator[str]:
+    if detect[0] in ('all_of', 'any_of'):
+        for spec in detect[1:]:
+            yield from _detect_oids(spec)
+    else:
+        yield detect[1]
+
+
+def evaluate_detect(detect: Tuple[Any, ...], walk: Walk) -> bool:
+    kind = detect[0]
+    if kind == 'all_of':
+        return all(evaluate_detect(spec, walk) for spec in detect[1:])
+    if kind == 'any_of':
+        return any(evaluate_detect(spec, walk) for spec in detect[1:])
+    oid = detect[1]
+    if oid.endswith('.*'):
+        prefix = oid[:-1]
+        value = next((value for key, value in walk.items() if key.startswith(prefix)), None)
+    else:
+        value = walk.get(oid)
+    if kind == 'exists':
+        return value is not None
+    if value is None:
+        return False
+    if kind == 'equals':
+        return value == detect[2]
+    if kind == 'startswith':
+        return value.startswith(detect[2])
+    if kind == 'contains':
+        return detect[2] in value
+    raise ValueError(f'unsupported detection {kind}')
+
+
+def string_table(fetch: Any, walk: Walk) -> List[List[str]]:
+    """
+    The string table of an SNMPTree: one row per index found in any column, missing values are ''.
+    """
+    columns: List[Dict[str, str]] = []
+    indexes: Dict[str, Tuple[int, ...]] = {}
+    for oid in fetch.oids:
+        column = {}
+        if not isinstance(oid, OIDEnd):
+            prefix = f'{fetch.base}.{oid}.'
+            for key, value in walk.items():
+                if key.startswith(prefix):
+                    index = key[len(prefix):]
+                    column[index] = value
+                    indexes.setdefault(index, _oid_key(index))
+                elif key == prefix[:-1]:  # scalar, i.e. '1.0'
+                    column[''] = value
+                    indexes.setdefault('', ())
+        columns.append(column)
+    rows = []
+    for index in sorted(indexes, key=indexes.__getitem__):
+        rows.append([index if isinstance(oid, OIDEnd) else column.get(index, '')
+                     for oid, column in zip(fetch.oids, columns)])
+    return rows
+
+
+def parse_sections(walk: Walk) -> Dict[str, Any]:
+    parsed = {}
+    for name, section in REGISTRY['snmp_section'].items():
+        if not evaluate_detect(section['detect'], walk):
+            continue
+        rows = string_table(section['fetch'], walk)
+        if rows:
+            parsed[section.get('parsed_section_name', name)] = section['parse_function'](rows)
+    return parsed
+
+
+def _merged(defaults: Optional[Mapping[str, Any]], ruleset: Optional[str], rules: Mapping[str, Any]) -> Dict[str, Any]:
+    params = dict(defaults or {})
+    params.update(rules.get(ruleset, {}))
+    return params
+
+
+def _section_kwargs(sections: List[str], parsed: Mapping[str, Any]) -> Dict[str, Any]:
+    if len(sections) == 1:
+        return {'section': parsed.get(sections[0])}
+    return {f'section_{name}': parsed.get(name) for name in sections}
+
+
+def replay_host(host: str, path: Path, rules: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    walk = read_walk(path, _walk_prefixes())
+    parsed = parse_sections(walk)
+    results = []
+    for name, plugin in sorted(REGISTRY['check_plugin'].items()):
+        sections = plugin.get('sections', [name])
+        if not any(section in parsed for section in sections):
+            continue
+        kwargs = _section_kwargs(sections, parsed)
+        discovery_kwargs = dict(kwargs)
+        if plugin.get('discovery_ruleset_name'):
+            discovery_kwargs['params'] = _merged(
+                plugin.get('discovery_default_parameters'), plugin['discovery_ruleset_name'], rules)
+        check_params = _merged(plugin.get('check_default_parameters'), plugin.get('check_ruleset_name'), rules)
+        for service in plugin['discovery_function'](**discovery_kwargs):
+            if not isinstance(service, Service):
+                continue
+            check_kwargs = dict(kwargs)
+            description = plugin['service_name']
+            if service.item is not None:
+                check_kwargs['item'] = service.item
+                description = description % service.item
+            if plugin.get('check_ruleset_name'):
+                check_kwargs['params'] = check_params
+            set_value_store({})
+            results.append(_service_result(host, description, plugin['check_function'](**check_kwargs)))
+    return results
+
+
+def _service_result(host: str, description: str, check_result: Iterable[Any]) -> Dict[str, Any]:
+    state = 0
+    summary = []
+    details = []
+    metrics = {}
+    for result in check_result:
+        if hasattr(result, 'details'):
+            state = 2 if 2 in (state, result.state) else max(state, result.state)
+            if result.summary:
+                summary.append(result.summary)
+            details.append(result.details)
+        elif hasattr(result, 'value'):
+            metrics[result.name] = result.value
+    return {
+        'host': host,
+        'service': description,
+        'state': state,
+        'summary': ', '.join(summary),
+        'details': details,
+        'metrics': metrics,
+    }
+
+
+def _init_worker() -> None:
+    install()
+    for plugin in sorted(AGENT_BASED_DIR.glob('*.py')):
+        load_plugin(plugin.stem)
+
+
+def _replay(task: Tuple[str, Path, Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    host, path, rules = task
+    try:
+        return replay_host(host, path, rules)
+    except Exception as exc:  # pylint: disable=broad-except
+        return [{'host': host, 'service': None, 'state': 3, 'summary': f'replay failed: {exc!r}',
+                 'details': [], 'metrics': {}}]
+
+
+def _walk_files(paths: List[Path]) -> Iterator[Tuple[str, Path]]:
+    for path in paths:
+        if path.is_dir():
+            for file in sorted(path.iterdir()):
+                if file.is_file():
+                    yield file.name.split('.', 1)[0], file
+        else:
+            yield path.name.split('.', 1)[0], path
+
+
+def _load_rules(path: Optional[Path]) -> Dict[str, Any]:
+    if path is None:
+        return {}
+    text = path.read_text()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return ast.literal_eval(text)
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Replay SNMP walks through the ospf_neighbor plugins')
+    parser.add_argument('walks', nargs='+', type=Path, help='walk files or directories with one walk per host')
+    parser.add_argument('--params', type=Path, help='rule parameters by ruleset name (python literal or JSON)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='worker processes (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='output one JSON object per service')
+    parser.add_argument('--details', action='store_true', help='include the long output in the text output')
+    args = parser.parse_args(argv)
+
+    rules = _load_rules(args.params)
+    tasks = [(host, path, rules) for host, path in _walk_files(args.walks)]
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker) as executor:
+        for results in executor.map(_replay, tasks, chunksize=max(1, len(tasks) // (args.jobs * 4 or 1))):
+            for result in results:
+                if args.json:
+                    print(json.dumps(result))
+                    continue
+                print(f"{result['host']}\t{result['service']}\t{'OWCU'[result['state']]}\t{result['summary']}")
+                if args.details:
+                    for line in result['details']:
+                        print(f'\t\t\t{line}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Simulated SNMPv2c agents (GET, GETNEXT, GETBULK) for testing the special agent
+# agent_ospf_neighbor without routers. Each router answers on its own UDP port, starting with
+# --port. The routers are synthetic OSPF-MIB::ospfNbrTable tables (see ospf_nbr_table.py) or
+# walks in the format of "snmpwalk -ObentU" (see CONTRIBUTING.md). Synthetic routers can have an
+# OSPFV3-MIB::ospfv3NbrTable (--ospfv3) and further OSPF instances in SNMP contexts (--contexts),
+# answered for the community "<community>@<context>".
+#
+# Prints one target per router as expected by agent_ospf_neighbor, i.e.
+#
+# tools/ospf_snmp_simulator.py --routers 200 --neighbors 100 > /tmp/targets &
+# agents/special/agent_ospf_neighbor --details $(cat /tmp/targets)
+#
+# usage: tools/ospf_snmp_simulator.py [--routers 1] [--neighbors 100] [--walk r1.snmpwalk] [--delay 0.01] [--drop 0.1]
+#                                     [--ospfv3] [--contexts RED,BLUE]
+#
+
+import argparse
+import asyncio
+import random
+import sys
+from bisect import bisect_left, bisect_right
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+from pathlib import Path
+from types import ModuleType
+from ipaddress import IPv4Address
+from typing import Dict, List, Optional, Tuple
+
+from ospf_nbr_table import _generate_rows
+
+AGENT_PATH = Path(__file__).resolve().parent.parent / 'agents' / 'special' / 'agent_ospf_neighbor'
+
+
+def _load_agent() -> ModuleType:
+    """
+    The BER codec of the special agent, the agent has no .py extension.
+    """
+    loader = SourceFileLoader('agent_ospf_neighbor', str(AGENT_PATH))
+    module = module_from_spec(spec_from_loader(loader.name, loader))
+    loader.exec_module(module)
+    return module
+
+
+agent = _load_agent()
+
+_WALK_TYPES = {
+    'INTEGER': agent.TAG_INTEGER,
+    'IpAddress': agent.TAG_IP_ADDRESS,
+    'Counter32': agent.TAG_COUNTER32,
+    'Gauge32': agent.TAG_GAUGE32,
+    'Counter64': agent.TAG_COUNTER64,
+    'Timeticks': agent.TAG_TIMETICKS,
+    'OID': agent.TAG_OID,
+    'STRING': agent.TAG_OCTET_STRING,
+    'Hex-STRING': agent.TAG_OCTET_STRING,
+}
+
+
+def _oid(text: str) -> Tuple[int, ...]:
+    return tuple(int(arc) for arc in text.strip('.').split('.'))
+
+
+def _walk_value(type_name: str, value: str):
+    if type_name == 'Hex-STRING':
+        return bytes.fromhex(value)
+    if type_name == 'STRING':
+        return value.strip('"').encode('latin-1', errors='replace')
+    if type_name == 'OID':
+        return _oid(value)
+    if type_name == 'Timeticks':
+        return int(value[1:value.index(')')])
+    if type_name == 'IpAddress':
+        return value
+    return int(value.split('(')[-1].rstrip(')'))  # INTEGER: up(1) without -Oe
+
+
+def read_walk(path: Path) -> List['agent.VarBind']:
+    varbinds = []
+    with path.open(encoding='utf-8', errors='replace') as file:
+        for line in file:
+            oid, sep, value = line.rstrip('\n').partition(' = ')
+            type_name, sep2, value = value.partition(': ')
+            if not sep or not sep2 or type_name not in _WALK_TYPES:
+                continue
+            varbinds.append(agent.VarBind(_oid(oid), _WALK_TYPES[type_name], _walk_value(type_name, value.strip())))
+    return varbinds
+
+
+def synthetic_router(count: int, seed: int, ospfv3: bool = False) -> List['agent.VarBind']:
+    varbinds = [
+        agent.VarBind(_oid('.1.3.6.1.2.1.1.2.0'), agent.TAG_OID, _oid('.1.3.6.1.4.1.8072.3.2.10')),
+        agent.VarBind(_oid('.1.3.6.1.2.1.14.1.1.0'), agent.TAG_IP_ADDRESS,  # ospfRouterId
+                      f'10.255.{(seed >> 8) & 0xff}.{seed & 0xff}'),
+        agent.VarBind(_oid('.1.3.6.1.2.1.14.1.2.0'), agent.TAG_INTEGER, 1),  # ospfAdminStat
+    ]
+    types = {
+        3: agent.TAG_IP_ADDRESS,
+        4: agent.TAG_INTEGER,
+        7: agent.TAG_COUNTER32,
+        8: agent.TAG_GAUGE32,
+    }
+    entry = agent.OSPF_NBR_ENTRY
+    for row in _generate_rows(count, seed):
+        index = _oid(row[0])
+        ip_address = '.'.join(row[0].split('.')[:4])
+        varbinds.append(agent.VarBind(entry + (1,) + index, agent.TAG_IP_ADDRESS, ip_address))
+        varbinds.append(agent.VarBind(entry + (2,) + index, agent.TAG_INTEGER, index[-1]))
+        # ospfNbrRtrId, Options, Priority, State, Events, LSRetransQLen, Permanence, HelloSuppressed, Helper...
+        for column, value in zip([3, 4, 5, 6, 7, 8, 10, 11, 12, 13, 14], row[1:]):
+            if value == '':
+                continue  # column not implemented
+            tag = types.get(column, agent.TAG_INTEGER)
+            if tag == agent.TAG_IP_ADDRESS:
+                varbinds.append(agent.VarBind(entry + (column,) + index, tag, value))
+            else:
+                value = ord(value) if column == 4 else int(value)
+                varbinds.append(agent.VarBind(entry + (column,) + index, tag, value))
+    if ospfv3:
+        varbinds += _synthetic_ospfv3(count, seed)
+    return sorted(varbinds)
+
+
+def _synthetic_ospfv3(count: int, seed: int) -> List['agent.VarBind']:
+    """
+    OSPFV3-MIB::ospfv3NbrTable with the same neighbors, one per interface (ospfv3NbrIfIndex).
+    """
+    varbinds = [agent.VarBind(_oid('.1.3.6.1.2.1.191.1.1.2.0'), agent.TAG_INTEGER, 1)]  # ospfv3AdminStatus
+    entry = agent.OSPFV3_NBR_ENTRY
+    for if_index, row in enumerate(_generate_rows(count, seed), start=1):
+        index = (if_index, 0, int(IPv4Address(row[1])))
+        # ospfv3NbrOptions (V6, E, R), Priority, State, Events, LsRetransQLen
+        for column, tag, value in [
+            (6, agent.TAG_INTEGER, 0x13),
+            (7, agent.TAG_INTEGER, int(row[3])),
+            (8, agent.TAG_INTEGER, int(row[4])),
+            (9, agent.TAG_COUNTER32, int(row[5])),
+            (10, agent.TAG_GAUGE32, int(row[6])),
+        ]:
+            varbinds.append(agent.VarBind(entry + (column,) + index, tag, value))
+    return varbinds
+
+
+class SimulatedAgent(asyncio.DatagramProtocol):
+    def __init__(self, contexts: Dict[str, List['agent.VarBind']], args: argparse.Namespace) -> None:
+        # the MIB view of each community, "<community>@<context>" for the contexts
+        self._views = {}
+        for context, varbinds in contexts.items():
+            community = f'{args.community}@{context}' if context else args.community
+            varbinds = sorted(varbinds)
+            self._views[community.encode()] = (varbinds, [varbind.oid for varbind in varbinds])
+        self._varbinds: List['agent.VarBind'] = []
+        self._oids: List[Tuple[int, ...]] = []
+        self._delay = args.delay
+        self._drop = args.drop
+        self._max_size = args.max_size
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def _get(self, oid) -> 'agent.VarBind':
+        position = bisect_left(self._oids, oid)
+        if position < len(self._oids) and self._oids[position] == oid:
+            return self._varbinds[position]
+        return agent.VarBind(oid, agent.TAG_NO_SUCH_INSTANCE, None)
+
+    def _next(self, oid) -> 'agent.VarBind':
+        position = bisect_right(self._oids, oid)
+        if position < len(self._oids):
+            return self._varbinds[position]
+        return agent.VarBind(oid, agent.TAG_END_OF_MIB_VIEW, None)
+
+    def answer(self, request: 'agent.Message') -> List['agent.VarBind']:
+        if request.pdu == agent.PDU_GET:
+            return [self._get(varbind.oid) for varbind in request.varbinds]
+        if request.pdu == agent.PDU_GET_NEXT:
+            return [self._next(varbind.oid) for varbind in request.varbinds]
+        non_repeaters = max(request.field1, 0)
+        varbinds = [self._next(varbind.oid) for varbind in request.varbinds[:non_repeaters]]
+        current = [varbind.oid for varbind in request.varbinds[non_repeaters:]]
+        for _repetition in range(max(request.field2, 0)):
+            if not current or len(varbinds) + len(current) > self._max_size:
+                break
+            row = [self._next(oid) for oid in current]
+            varbinds.extend(row)
+            current = [varbind.oid for varbind in row]
+            if all(varbind.tag == agent.TAG_END_OF_MIB_VIEW for varbind in row):
+                break
+        return varbinds
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        try:
+            request = agent.decode_message(data)
+        except agent.SnmpError:
+            return
+        if request.community not in self._views or random.random() < self._drop:
+            return
+        self._varbinds, self._oids = self._views[request.community]
+        response = agent.encode_message(request._replace(
+            pdu=agent.PDU_RESPONSE,
+            field1=0,
+            field2=0,
+            varbinds=self.answer(request),
+        ))
+        if self._delay:
+            asyncio.get_running_loop().call_later(self._delay, self.transport.sendto, response, addr)
+        else:
+            self.transport.sendto(response, addr)
+
+
+async def serve(routers: List[Tuple[str, Dict[str, List['agent.VarBind']]]], args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    for number, (name, contexts) in enumerate(routers):
+        port = args.port + number
+        await loop.create_datagram_endpoint(
+            lambda contexts=contexts: SimulatedAgent(contexts, args), local_addr=(args.address, port))
+        sys.stdout.write(f'{name}={args.address}:{port}\n')
+    sys.stdout.flush()
+    await asyncio.Event().wait()
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--address', default='127.0.0.1', help='listen address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=16100, help='UDP port of the first router (default: 16100)')
+    parser.add_argument('--community', default='public', help='SNMPv2c community (default: public)')
+    parser.add_argument('--routers', type=int, default=0, help='number of synthetic routers')
+    parser.add_argument('--neighbors', type=int, default=100, help='neighbors per synthetic router (default: 100)')
+    parser.add_argument('--walk', type=Path, action='append', default=[],
+                        help='serve a walk as router, the host name is the file name without extension')
+    parser.add_argument('--delay', type=float, default=0.0, help='delay of each response in seconds')
+    parser.add_argument('--drop', type=float, default=0.0, help='share of requests not answered (0..1)')
+    parser.add_argument('--max-size', type=int, default=200, help='max number of varbinds per response')
+    parser.add_argument('--ospfv3', action='store_true', help='synthetic routers have an OSPFv3 neighbor table')
+    parser.add_argument('--contexts', default='',
+                        help='comma separated SNMP contexts with further OSPF instances of the synthetic routers')
+    args = parser.parse_args(argv)
+
+    contexts = [''] + [context for context in args.contexts.split(',') if context]
+    routers = [(path.stem, {'': read_walk(path)}) for path in args.walk]
+    routers += [
+        (f'router{number:04d}', {
+            context: synthetic_router(args.neighbors, number * len(contexts) + position, args.ospfv3)
+            for position, context in enumerate(contexts)
+        }) for number in range(args.routers)
+    ]
+    if not routers:
+        parser.error('no routers, use --routers and/or --walk')
+    try:
+        asyncio.run(serve(routers, args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: GNU General Public License v2
+#
+# Date  : 2026-10-18
+#
+# Local sender of OSPF-TRAP-MIB::ospfNbrStateChange traps for testing the trap bridge
+# (bin/ospf_neighbor_trap_bridge) and the Event Console rule pack. Sends an SNMPv2c trap
+# to a trap receiver (snmptrapd or the Event Console) or prints the trap in the traphandle
+# format of snmptrapd, to pipe it into the bridge directly:
+#
+# tools/ospf_trap_sender.py --router-id 10.0.0.1 --neighbor 172.17.108.52 --state down --traphandle \
+#     | bin/ospf_neighbor_trap_bridge
+# tools/ospf_trap_sender.py --router-id 10.0.0.1 --neighbor 172.17.108.52 --state full --target 127.0.0.1:162
+#
+
+import argparse
+import socket
+import sys
+from typing import List
+
+from ospf_snmp_simulator import agent
+
+SYS_UP_TIME = (1, 3, 6, 1, 2, 1, 1, 3, 0)
+SNMP_TRAP_OID = (1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0)
+OSPF_NBR_STATE_CHANGE = (1, 3, 6, 1, 2, 1, 14, 16, 2, 2)
+OSPF_ROUTER_ID = (1, 3, 6, 1, 2, 1, 14, 1, 1, 0)
+
+STATES = ['down', 'attempt', 'init', 'twoWay', 'exchangeStart', 'exchange', 'loading', 'full']
+
+
+def _oid_text(oid) -> str:
+    return '.' + '.'.join(str(arc) for arc in oid)
+
+
+def trap_varbinds(args: argparse.Namespace) -> List['agent.VarBind']:
+    index = tuple(int(part) for part in args.neighbor.split('.')) + (args.index,)
+    entry = agent.OSPF_NBR_ENTRY
+    return [
+        agent.VarBind(SYS_UP_TIME, agent.TAG_TIMETICKS, 4242),
+        agent.VarBind(SNMP_TRAP_OID, agent.TAG_OID, OSPF_NBR_STATE_CHANGE),
+        agent.VarBind(OSPF_ROUTER_ID, agent.TAG_IP_ADDRESS, args.router_id),
+        agent.VarBind(entry + (1,) + index, agent.TAG_IP_ADDRESS, args.neighbor),  # ospfNbrIpAddr
+        agent.VarBind(entry + (2,) + index, agent.TAG_INTEGER, args.index),  # ospfNbrAddressLessIndex
+        agent.VarBind(entry + (3,) + index, agent.TAG_IP_ADDRESS, args.neighbor_id),  # ospfNbrRtrId
+        agent.VarBind(entry + (6,) + index, agent.TAG_INTEGER, STATES.index(args.state) + 1),  # ospfNbrState
+    ]
+
+
+def traphandle_text(varbinds: List['agent.VarBind'], source: str) -> str:
+    """
+    The trap as snmptrapd passes it to a traphandle with numeric OIDs (-On).
+    """
+    lines = [source, f'UDP: [{source}]:50000->[127.0.0.1]:162']
+    for varbind in varbinds:
+        if varbind.tag == agent.TAG_OID:
+            value = _oid_text(varbind.value)
+        elif varbind.tag == agent.TAG_IP_ADDRESS:
+            value = varbind.value
+        else:
+            value = str(varbind.value)
+        lines.append(f'{_oid_text(varbind.oid)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--router-id', required=True, help='ospfRouterId of the sending router')
+    parser.add_argument('--neighbor', required=True, help='ospfNbrIpAddr of the neighbor')
+    parser.add_argument('--index', type=int, default=0, help='ospfNbrAddressLessIndex (default: 0)')
+    parser.add_argument('--neighbor-id', default='0.0.0.0', help='ospfNbrRtrId of the neighbor')
+    parser.add_argument('--state', choices=STATES, required=True, help='new ospfNbrState')
+    parser.add_argument('--community', default='public', help='SNMPv2c community (default: public)')
+    parser.add_argument('--target', default='127.0.0.1:162', help='trap receiver (default: 127.0.0.1:162)')
+    parser.add_argument('--traphandle', action='store_true',
+                        help='print the trap in the traphandle format of snmptrapd instead of sending it')
+    args = parser.parse_args(argv)
+
+    varbinds = trap_varbinds(args)
+    if args.traphandle:
+        sys.stdout.write(traphandle_text(varbinds, args.router_id))
+        return 0
+
+    address, _sep, port = args.target.rpartition(':')
+    message = agent.encode_message(agent.Message(
+        community=args.community.encode(),
+        pdu=agent.PDU_TRAP_V2,
+        request_id=1,
+        field1=0,
+        field2=0,
+        varbinds=varbinds,
+    ))
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(message, (address, int(port)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))